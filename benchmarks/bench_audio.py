@@ -0,0 +1,53 @@
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from shotclock_audio import AudioService, NullBackend
+
+
+class SlowBackend(NullBackend):
+    # Holds the worker for as long as a real beep would play
+    def __init__(self, seconds):
+        NullBackend.__init__(self)
+        self.seconds = seconds
+
+    def play(self, data):
+        NullBackend.play(self, data)
+        time.sleep(self.seconds)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Audio dispatch latency benchmark")
+    parser.add_argument("--alerts", type=int, default=2000)
+    parser.add_argument("--interval", type=float, default=0.002, help="seconds between alerts")
+    parser.add_argument("--play", type=float, default=0.0, help="simulated playback time per alert")
+    args = parser.parse_args()
+
+    audio = AudioService(SlowBackend(args.play))
+    calls = []
+    latencies = []
+    for _ in range(args.alerts):
+        t0 = time.perf_counter()
+        audio.alert()
+        calls.append(time.perf_counter() - t0)
+        time.sleep(args.interval)
+        if audio.last_latency is not None:
+            latencies.append(audio.last_latency)
+    audio.wait_idle(5)
+    audio.close()
+
+    calls.sort()
+    latencies.sort()
+    print("alert() call    p50 %7.1f us  p99 %7.1f us  max %7.1f us" % (
+        calls[len(calls) // 2] * 1e6, calls[int(len(calls) * 0.99)] * 1e6, calls[-1] * 1e6))
+    if latencies:
+        print("dispatch delay  p50 %7.1f us  p99 %7.1f us  max %7.1f us" % (
+            latencies[len(latencies) // 2] * 1e6, latencies[int(len(latencies) * 0.99)] * 1e6, latencies[-1] * 1e6))
+    print("requested %d  played %d  coalesced %d" % (audio.requested, audio.played, audio.coalesced))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+import argparse
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from shotclock_engine import ShotClockEngine, VirtualClock
+from shotclock_net import StatePublisher, StateReceiver
+
+
+def percentile(samples, pct):
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * pct / 100))] if samples else 0.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Loopback broadcast latency and fan-out benchmark")
+    parser.add_argument("--clients", type=int, default=64)
+    parser.add_argument("--updates", type=int, default=500)
+    parser.add_argument("--interval", type=float, default=0.01, help="seconds between clock updates")
+    parser.add_argument("--group", default="239.255.42.99")
+    parser.add_argument("--port", type=int, default=5996)
+    args = parser.parse_args()
+
+    receivers = [StateReceiver(args.group, args.port, "127.0.0.1", timeout=0.2) for _ in range(args.clients)]
+    latencies = [[] for _ in receivers]
+    stop = threading.Event()
+
+    def listen(index, receiver):
+        while not stop.is_set():
+            if receiver.receive() and receiver.latency is not None:
+                latencies[index].append(receiver.latency)
+
+    threads = [threading.Thread(target=listen, args=(i, r), daemon=True) for i, r in enumerate(receivers)]
+    for t in threads:
+        t.start()
+
+    clock = VirtualClock()
+    engine = ShotClockEngine(clock)
+    engine.configure(shot_duration=args.updates + 10)
+    publisher = StatePublisher(engine, args.group, args.port, interface="127.0.0.1", snapshot_interval=0.25)
+    engine.reset()
+    engine.start()
+    for _ in range(args.updates):
+        clock.advance(engine.next_delay())
+        engine.tick()
+        time.sleep(args.interval)
+    engine.pause()
+    time.sleep(0.5)
+    stop.set()
+    for t in threads:
+        t.join()
+
+    final_text = engine.text
+    publisher.close()
+    samples = [x for per in latencies for x in per]
+    in_sync = sum(1 for r in receivers if r.state.get("text") == final_text and r.state.get("running") is False)
+    print("clients %d  datagrams sent %d  final seq %d" % (args.clients, publisher.sent, publisher.seq))
+    print("received per client  min %d  max %d  gaps %d" % (
+        min(r.received for r in receivers), max(r.received for r in receivers), sum(r.gaps for r in receivers)))
+    print("latency  p50 %.3f ms  p99 %.3f ms  max %.3f ms" % (
+        percentile(samples, 50) * 1e3, percentile(samples, 99) * 1e3, max(samples or [0]) * 1e3))
+    print("clients showing final state %d/%d" % (in_sync, args.clients))
+    for r in receivers:
+        r.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from shotclock_engine import GRANULARITY, TENTH, Scheduler, ShotClockEngine, VirtualClock
+
+
+def percentile(samples, pct):
+    if not samples:
+        return 0.0
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * pct / 100))]
+
+
+def run_ticks(count, jitter, seed):
+    # Drive the engine like the Tk loop would: sleep for next_delay() plus
+    # some scheduling jitter, then tick. Shots restart as soon as they expire.
+    rng = random.Random(seed)
+    clock = VirtualClock()
+    engine = ShotClockEngine(clock)
+    engine.configure(tenths_below=5)
+    events = [0]
+    engine.subscribe(lambda event, eng: events.__setitem__(0, events[0] + 1))
+
+    latencies = []
+    perf = time.perf_counter_ns
+    engine.reset()
+    engine.start()
+    begin = perf()
+    for i in range(count):
+        delay = engine.next_delay()
+        if delay is None:
+            engine.reset()
+            engine.start()
+            continue
+        clock.advance(delay + rng.random() * jitter)
+        if i & 63:
+            engine.tick()
+        else:
+            t0 = perf()
+            engine.tick()
+            latencies.append(perf() - t0)
+    elapsed = (perf() - begin) / 1e9
+    return elapsed, events[0], latencies
+
+
+def run_actions(count, seed):
+    rng = random.Random(seed)
+    clock = VirtualClock()
+    engine = ShotClockEngine(clock)
+    actions = [engine.start, engine.pause, engine.reset, engine.add_extension, engine.start_game]
+
+    latencies = []
+    perf = time.perf_counter_ns
+    begin = perf()
+    for i in range(count):
+        clock.advance(rng.random())
+        action = actions[rng.randrange(len(actions))]
+        if i & 63:
+            action()
+        else:
+            t0 = perf()
+            action()
+            latencies.append(perf() - t0)
+    elapsed = (perf() - begin) / 1e9
+    return elapsed, latencies
+
+
+def expected_texts(seconds, tenths_below):
+    # Every value a full shot must show, in order, each exactly once
+    tenths_below = min(tenths_below, seconds)
+    texts = [str(n) for n in range(seconds - 1, max(tenths_below, 1) - 1, -1)]
+    texts += ["%.1f" % (n / 10) for n in range(tenths_below * 10 - 1, 0, -1)]
+    return texts + ["0"]
+
+
+def run_drift(hours, jitter, seed, tenths_below=5, scheduler=False):
+    # One long running shot with a late wakeup every time. Each displayed
+    # value must appear at or after the moment it becomes true and no later
+    # than the wakeup lateness allows (plus the scheduler grid), the full
+    # sequence must be shown with tenths included, and expiry must land on
+    # the deadline the same way. Returns (worst lateness, failures).
+    rng = random.Random(seed)
+    clock = VirtualClock(1000.0)
+    engine = ShotClockEngine(clock)
+    seconds = int(hours * 3600)
+    engine.configure(shot_duration=seconds, tenths_below=tenths_below)
+    engine.reset()
+    bound = jitter + (GRANULARITY if scheduler else 0.0) + 1e-6
+    seen = []
+    failures = []
+    lateness = [0.0]
+
+    def check(event, eng):
+        if event == "tick":
+            seen.append(eng.text)
+            due = deadline - float(eng.text)
+        elif event == "expire":
+            due = deadline
+        else:
+            return
+        late = clock() - due
+        lateness[0] = max(lateness[0], late)
+        if not -1e-6 <= late <= bound:
+            failures.append("%s %r at %+.6f s from its boundary" % (event, eng.text, late))
+
+    engine.subscribe(check)
+    deadline = clock() + seconds
+    if scheduler:
+        sched = Scheduler(clock)
+        sched.add(engine)
+        engine.start()
+        while engine.running:
+            clock.advance(sched.next_delay() + rng.random() * jitter)
+            sched.run_due()
+    else:
+        engine.start()
+        while engine.running:
+            clock.advance(engine.next_delay() + rng.random() * jitter)
+            engine.tick()
+
+    expected = expected_texts(seconds, tenths_below)
+    if seen != expected:
+        at = next((i for i, (a, b) in enumerate(zip(seen, expected)) if a != b), min(len(seen), len(expected)))
+        failures.append("displayed %d values, expected %d; first difference at #%d: %r instead of %r" % (
+            len(seen), len(expected), at, seen[at] if at < len(seen) else None,
+            expected[at] if at < len(expected) else None
+        ))
+    return lateness[0], failures
+
+
+def report(name, count, elapsed, latencies):
+    print("%-8s %10d events  %8.3f s  %12.0f ev/s  p50 %6.0f ns  p99 %6.0f ns  max %8.0f ns" % (
+        name, count, elapsed, count / elapsed,
+        percentile(latencies, 50), percentile(latencies, 99), max(latencies or [0])
+    ))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless shot clock engine benchmark")
+    parser.add_argument("--ticks", type=int, default=2000000)
+    parser.add_argument("--actions", type=int, default=1000000)
+    parser.add_argument("--hours", type=float, default=4.0)
+    parser.add_argument("--jitter", type=float, default=0.05, help="max scheduling lateness in seconds")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--tenths", type=int, default=5, help="tenths_below for the drift check")
+    args = parser.parse_args()
+    if args.tenths and args.jitter >= TENTH:
+        parser.error("--jitter must stay below a tenth while tenths are shown, or values are skipped by design")
+
+    elapsed, events, latencies = run_ticks(args.ticks, args.jitter, args.seed)
+    report("ticks", args.ticks, elapsed, latencies)
+    print("         %10d observer notifications" % events)
+
+    elapsed, latencies = run_actions(args.actions, args.seed)
+    report("actions", args.actions, elapsed, latencies)
+
+    failed = False
+    for name, scheduler in (("drift", False), ("drift/s", True)):
+        lateness, failures = run_drift(args.hours, args.jitter, args.seed, args.tenths, scheduler)
+        print("%-8s %.1f h session, tenths below %d s, worst lateness %.6f s, %d failures" % (
+            name, args.hours, args.tenths, lateness, len(failures)
+        ))
+        for failure in failures[:10]:
+            print("         FAIL %s" % failure)
+        failed = failed or bool(failures)
+    if failed:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
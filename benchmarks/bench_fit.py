@@ -0,0 +1,80 @@
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from shotclock_engine import Settings
+from shotclock_fit import FILL, FontFitter, sample_strings
+
+# Rough bold Arial proportions at 1 px, with the rounding a real font has
+ADVANCE = {d: 0.556 for d in "0123456789"}
+ADVANCE["."] = 0.278
+LINESPACE = 1.15
+
+
+def synthetic_measure(size, text):
+    return int(round(sum(ADVANCE[c] for c in text) * size)), int(round(LINESPACE * size))
+
+
+def check(fitter, width, height, samples):
+    # The answer must fit, and one pixel more must not fit every sample
+    size = fitter.fit(width, height, samples)
+    ok = all(fitter.fits_box(size, s, width, height) for s in samples) or size == fitter.min_size
+    bigger = all(fitter.fits_box(size + 1, s, width, height) for s in samples)
+    return ok and (not bigger or size == fitter.max_size)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Display font fit speed and correctness")
+    parser.add_argument("--sizes", type=int, default=20000, help="simulated window sizes")
+    parser.add_argument("--ticks", type=int, default=1000000, help="cached lookups to time")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+
+    configs = [
+        Settings(),
+        Settings(shot_duration=90, extension=15),
+        Settings(tenths_below=10),
+    ]
+    boxes = [(rng.randint(120, 7680), rng.randint(80, 4320)) for _ in range(args.sizes)]
+    fitter = FontFitter(synthetic_measure)
+
+    t0 = time.perf_counter()
+    wrong = []
+    for width, height in boxes:
+        samples = sample_strings(configs[rng.randrange(len(configs))])
+        if not check(fitter, width, height, samples):
+            wrong.append((width, height, samples))
+    cold = time.perf_counter() - t0
+    print("cold fits   %d window sizes in %.1f ms (%.1f us each), %d measurements, %d wrong" % (
+        len(boxes), cold * 1e3, cold / len(boxes) * 1e6, fitter.measurements, len(wrong)))
+    for width, height, samples in wrong[:10]:
+        print("            FAIL %dx%d %s -> %d px" % (width, height, "/".join(samples), fitter.fit(width, height, samples)))
+
+    # Ticks and drags back over known sizes only hit the memo
+    samples = sample_strings(configs[0], "30")
+    width, height = boxes[0]
+    fitter.fit(width, height, samples)
+    before = fitter.measurements
+    t0 = time.perf_counter()
+    for i in range(args.ticks):
+        fitter.fit(width, height, samples)
+    warm = time.perf_counter() - t0
+    remeasured = fitter.measurements - before
+    print("cached fits %d lookups in %.1f ms (%.0f ns each), %d new measurements" % (
+        args.ticks, warm * 1e3, warm / args.ticks * 1e9, remeasured))
+
+    print("800x600 window: two digits %d px, three digits after extensions %d px (fill ratio %.2f)" % (
+        fitter.fit(800, 600, sample_strings(configs[0])),
+        fitter.fit(800, 600, sample_strings(configs[0], "105")), FILL))
+
+    if wrong or remeasured:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+import argparse
+import io
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import shotclock_journal
+from shotclock_engine import ShotClockEngine, VirtualClock
+
+
+def play_table(directory, name, matches, shots, rng, crash):
+    # Simulates a table session on a virtual clock and journals it. With
+    # crash=True the recorder is abandoned without a close record.
+    clock = VirtualClock(rng.random() * 1000)
+    engine = ShotClockEngine(clock)
+    recorder = shotclock_journal.open_session(engine, directory, name)
+    costs = []
+    perf = time.perf_counter_ns
+
+    def timed(action):
+        t0 = perf()
+        action()
+        costs.append(perf() - t0)
+
+    for _ in range(matches):
+        timed(engine.start_game)
+        for shot in range(shots):
+            if shot:
+                timed(engine.reset)
+            timed(engine.start)
+            used = rng.uniform(3, engine.remaining + 5)
+            if rng.random() < 0.1:
+                clock.advance(used / 2)
+                timed(engine.add_extension)
+            while engine.running and used > 0:
+                step = min(engine.next_delay(), used)
+                clock.advance(step)
+                used -= step
+                t0 = perf()
+                engine.tick()
+                costs.append(perf() - t0)
+            if engine.running:
+                timed(engine.pause)
+    if not crash:
+        recorder.close()
+    else:
+        recorder.writer.close()
+    return engine, recorder, costs
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Journal overhead, resume and stats benchmark")
+    parser.add_argument("--tables", type=int, default=16)
+    parser.add_argument("--matches", type=int, default=8)
+    parser.add_argument("--shots", type=int, default=40)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+
+    with tempfile.TemporaryDirectory() as directory:
+        costs = []
+        for table in range(args.tables):
+            crash = table == 0
+            engine, recorder, table_costs = play_table(
+                directory, "table-%d" % (table + 1), args.matches, args.shots, rng, crash)
+            costs.extend(table_costs)
+            if crash:
+                crashed = engine
+
+        costs.sort()
+        print("engine thread cost per event with journaling  p50 %.1f us  p99 %.1f us" % (
+            costs[len(costs) // 2] / 1e3, costs[int(len(costs) * 0.99)] / 1e3))
+
+        t0 = time.perf_counter()
+        restored = ShotClockEngine(VirtualClock())
+        shotclock_journal.restore_latest(restored, directory, "table-1")
+        elapsed = time.perf_counter() - t0
+        path = shotclock_journal.latest_session(directory, "table-1")
+        print("resume after crash: %.2f ms for a %d KB journal; remaining %.3f (expected %.3f), settings match %s" % (
+            elapsed * 1e3, os.path.getsize(path) // 1024, restored.remaining,
+            crashed.current_remaining(), restored.settings == crashed.settings))
+
+        paths = sorted(os.path.join(directory, p) for p in os.listdir(directory) if p.endswith(shotclock_journal.SUFFIX))
+        size = sum(os.path.getsize(p) for p in paths)
+        out = io.StringIO()
+        t0 = time.perf_counter()
+        shotclock_journal.print_stats(paths, out)
+        elapsed = time.perf_counter() - t0
+        summary = [line for line in out.getvalue().splitlines() if "matches," in line][0]
+        print("stats: %s in %.1f ms (%.1f MB/s over %d journals)" % (
+            summary, elapsed * 1e3, size / 1e6 / elapsed, len(paths)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+import argparse
+import asyncio
+import json
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from shotclock_engine import ShotClockEngine
+from shotclock_remote import POLL_MS, CommandDispatcher, CommandServer, EngineActions
+
+
+def percentile(samples, pct):
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * pct / 100))] if samples else 0.0
+
+
+def drive(engine, dispatcher, stop):
+    # Stands in for the Tk loop: drain commands every POLL_MS, tick when due
+    while not stop.is_set():
+        dispatcher.drain()
+        if engine.running:
+            engine.tick()
+        time.sleep(POLL_MS / 1000)
+
+
+async def client(port, count, batch, rtts, errors):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    commands = ["reset", "start", "extend", "pause", "state"]
+    for i in range(count):
+        if batch > 1:
+            request = [{"id": j, "cmd": commands[(i + j) % len(commands)]} for j in range(batch)]
+        else:
+            request = {"id": i, "cmd": commands[i % len(commands)]}
+        t0 = time.perf_counter()
+        writer.write((json.dumps(request) + "\n").encode())
+        reply = json.loads(await reader.readline())
+        rtts.append(time.perf_counter() - t0)
+        replies = reply if batch > 1 else [reply]
+        errors[0] += sum(1 for r in replies if not r.get("ok"))
+    writer.close()
+    await writer.wait_closed()
+
+
+async def subscriber(port, events, ready):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(b'{"id":0,"cmd":"subscribe"}\n')
+    await reader.readline()
+    ready.set()
+    try:
+        while True:
+            line = await reader.readline()
+            if not line:
+                break
+            events[0] += 1
+    except asyncio.CancelledError:
+        writer.close()
+
+
+async def run(port, clients, count, batch):
+    rtts, errors, events = [], [0], [0]
+    ready = asyncio.Event()
+    sub = asyncio.ensure_future(subscriber(port, events, ready))
+    await ready.wait()
+    begin = time.perf_counter()
+    await asyncio.gather(*(client(port, count, batch, rtts, errors) for _ in range(clients)))
+    elapsed = time.perf_counter() - begin
+    await asyncio.sleep(0.1)
+    sub.cancel()
+    return rtts, errors[0], events[0], elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Remote control round-trip benchmark")
+    parser.add_argument("--clients", type=int, default=50)
+    parser.add_argument("--commands", type=int, default=200, help="round trips per client")
+    parser.add_argument("--batch", type=int, default=1, help="commands per request line")
+    args = parser.parse_args()
+
+    engine = ShotClockEngine()
+    dispatcher = CommandDispatcher()
+    server = CommandServer(engine, EngineActions(engine), dispatcher, port=0).start()
+    stop = threading.Event()
+    driver = threading.Thread(target=drive, args=(engine, dispatcher, stop), daemon=True)
+    driver.start()
+
+    rtts, errors, events, elapsed = asyncio.run(run(server.port, args.clients, args.commands, args.batch))
+    stop.set()
+    driver.join()
+    server.close()
+
+    total = len(rtts) * args.batch
+    print("clients %d  requests %d  commands %d  errors %d  subscriber events %d" % (
+        args.clients, len(rtts), total, errors, events))
+    print("throughput %.0f commands/s" % (total / elapsed))
+    print("round trip  p50 %.2f ms  p99 %.2f ms  max %.2f ms" % (
+        percentile(rtts, 50) * 1e3, percentile(rtts, 99) * 1e3, max(rtts) * 1e3))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+import argparse
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from shotclock_engine import Scheduler, ShotClockEngine, VirtualClock
+
+
+def restart(event, engine):
+    # Tables keep playing: a new shot starts as soon as one expires
+    if event == "expire":
+        engine.reset()
+        engine.start()
+
+
+def build(tables, seed):
+    rng = random.Random(seed)
+    clock = VirtualClock()
+    scheduler = Scheduler(clock)
+    engines = []
+    for _ in range(tables):
+        engine = ShotClockEngine(clock)
+        engine.subscribe(restart)
+        scheduler.add(engine)
+        engines.append(engine)
+    # Tables start their first shot at unrelated moments
+    for engine in engines:
+        clock.advance(rng.random() / tables)
+        engine.reset()
+        engine.start()
+    return clock, scheduler, engines
+
+
+def simulate(clock, scheduler, minutes):
+    end = clock() + minutes * 60
+    while clock() < end:
+        clock.advance(scheduler.next_delay())
+        scheduler.run_due()
+
+
+def run(tables, minutes, seed):
+    # CPU is timed on its own; tracing every allocation would swamp it
+    clock, scheduler, engines = build(tables, seed)
+    cpu = time.process_time()
+    simulate(clock, scheduler, minutes)
+    cpu = time.process_time() - cpu
+    return scheduler.wakeups, scheduler.ticks, cpu
+
+
+def peak_memory(tables, minutes, seed):
+    # Peak traced memory over building the tables and running them, so heap
+    # entries and per-tick garbage count as well as the engines themselves
+    tracemalloc.start()
+    clock, scheduler, engines = build(tables, seed)
+    simulate(clock, scheduler, minutes)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Multi-table scheduler scaling benchmark")
+    parser.add_argument("--minutes", type=float, default=10.0, help="simulated minutes per run")
+    parser.add_argument("--max-tables", type=int, default=64)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    print("%6s %10s %10s %12s %12s %10s %10s" % (
+        "tables", "wakeups/s", "ticks/s", "cpu ms/min", "cpu/table", "memory KB", "KB/table"))
+    rows = []
+    tables = 1
+    while tables <= args.max_tables:
+        wakeups, ticks, cpu = run(tables, args.minutes, args.seed)
+        peak = peak_memory(tables, min(args.minutes, 1.0), args.seed)
+        seconds = args.minutes * 60
+        print("%6d %10.1f %10.1f %12.2f %12.3f %10.1f %10.2f" % (
+            tables, wakeups / seconds, ticks / seconds, cpu * 1e3 / args.minutes,
+            cpu * 1e3 / args.minutes / tables, peak / 1024, peak / 1024 / tables))
+        rows.append((tables, wakeups, ticks, cpu, peak))
+        tables *= 2
+
+    # Growth from the smallest to the largest run, as measured
+    first, last = rows[0], rows[-1]
+    if last[0] > first[0]:
+        print("\n%d tables vs %d: %.1fx tables, %.1fx wakeups, %.1fx ticks, %.1fx CPU, %.1fx memory" % (
+            last[0], first[0], last[0] / first[0], last[1] / first[1], last[2] / first[2],
+            last[3] / first[3], last[4] / first[4]))
+        print("memory per added table %.2f KB (engine and scheduler only, no Tk widgets)" % (
+            (last[4] - first[4]) / 1024 / (last[0] - first[0])))
+
+
+if __name__ == "__main__":
+    main()
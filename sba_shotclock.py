@@ -1,13 +1,29 @@
 import tkinter as tk
-from tkinter import colorchooser, filedialog
-import winsound
+from tkinter import colorchooser, filedialog, messagebox
+from tkinter import font as tkfont
+import argparse
+import socket
 import sys
 import os
+import time
+import wave
+
+import shotclock_journal
+import shotclock_net
+import shotclock_remote
+from shotclock_perf import PerfMonitor, default_path
+from shotclock_audio import AudioService
+from shotclock_engine import Scheduler, Settings, ShotClockEngine
+from shotclock_fit import FontFitter, sample_strings
 
 FONT_MAIN = ("Arial", 520, "bold")
 FONT_CTRL = ("Arial", 90, "bold")
 FONT_LABEL = ("Arial", 11)
 FONT_BTN = ("Arial", 11, "bold")
+FONT_TABLE = ("Arial", 28, "bold")
+FONT_OVERLAY = ("Courier", 10)
+OVERLAY_MS = 500
+RESIZE_DEBOUNCE_MS = 150
 
 def resource_path(relative_path):
     try:
@@ -16,18 +32,104 @@ def resource_path(relative_path):
         base_path = os.path.abspath(".")
     return os.path.join(base_path, relative_path)
 
+class DirtyLabel:
+    # Wraps a Label and only calls config() for text/color that changed
+    def __init__(self, widget):
+        self.widget = widget
+        self.text = widget.cget("text")
+        self.fg = widget.cget("fg")
+        self.repaints = 0
+
+    def show(self, text, fg):
+        changes = {}
+        if text != self.text:
+            changes["text"] = self.text = text
+        if fg != self.fg:
+            changes["fg"] = self.fg = fg
+        if changes:
+            self.widget.config(**changes)
+            self.repaints += 1
+        return bool(changes)
+
+FITTERS = {}
+
+def font_fitter(widget, family, weight):
+    # One fitter (and its memo) per font, shared by every display window
+    key = (family, weight)
+    if key not in FITTERS:
+        scratch = tkfont.Font(root=widget, family=family, weight=weight)
+
+        def measure(size, text):
+            scratch.configure(size=-size)
+            return scratch.measure(text), scratch.metrics("linespace")
+
+        FITTERS[key] = FontFitter(measure)
+    return FITTERS[key]
+
+class AutoFit:
+    # Keeps a display label's font as large as its window allows for the
+    # widest value the current settings can show. Window resizes are
+    # debounced and sizes come from the shared memo, so ticks never measure.
+    def __init__(self, label, font=FONT_MAIN):
+        family, size, weight = font
+        self.label = label
+        self.window = label.winfo_toplevel()
+        self.font = tkfont.Font(root=label, family=family, size=size, weight=weight)
+        self.fitter = font_fitter(label, family, weight)
+        self.samples = None
+        self.box = None
+        self.pending = None
+        label.config(font=self.font)
+        # The window decides the label size, never the other way round
+        self.window.pack_propagate(False)
+        self.window.bind("<Configure>", self.on_configure, add="+")
+
+    def on_configure(self, event):
+        if event.widget is not self.window:
+            return
+        if self.pending:
+            self.window.after_cancel(self.pending)
+        self.pending = self.window.after(RESIZE_DEBOUNCE_MS, self.refit)
+
+    def show(self, settings, text):
+        samples = sample_strings(settings, text)
+        if samples != self.samples:
+            self.samples = samples
+            self.refit()
+
+    def refit(self):
+        self.pending = None
+        width, height = self.window.winfo_width(), self.window.winfo_height()
+        if width <= 1 or height <= 1 or self.samples is None:
+            return
+        box = (width, height, self.samples)
+        if box == self.box:
+            return
+        self.box = box
+        size = self.fitter.fit(width, height, self.samples)
+        if self.font.cget("size") != -size:
+            self.font.configure(size=-size)
+
 class ShotClock:
-    def __init__(self):
+    def __init__(self, broadcast=None, control=None, journal=None, perf=None):
         self.root = tk.Tk()
         self.root.iconbitmap(resource_path("sba_shotclock.ico"))
         self.root.title("Shot Clock Controller")
         self.root.state("zoomed")
         self.root.configure(bg="black")
 
-        self.running = False
-        self.time_left = 40
-        self.alert_file_path = None
+        self.engine = ShotClockEngine()
+        self.engine.subscribe(self.on_engine_event)
+        self.perf = PerfMonitor(enabled=perf is not None)
+        self.perf_path = perf or default_path()
+        self.audio = AudioService()
+        self.audio.on_dispatch = lambda latency: self.perf.record("audio", latency)
+        self.publisher = None
+        if broadcast:
+            group, port = broadcast
+            self.publisher = shotclock_net.StatePublisher(self.engine, group, port)
         self.timer_id = None
+        self.timer_due = None
 
         # Register numeric validator
         self.vcmd_number = (self.root.register(self.validate_number), "%P")
@@ -48,6 +150,8 @@ class ShotClock:
             bg="black"
         )
         self.display_label.pack(expand=True, fill="both")
+        self.display_fit = AutoFit(self.display_label)
+        self.display_fit.show(self.engine.settings, self.engine.text)
 
         # ================= TOP DISPLAY =================
         self.controller_display = tk.Label(
@@ -68,6 +172,8 @@ class ShotClock:
         )
         self.mode_label.pack(pady=5)
 
+        self.renderers = [DirtyLabel(self.controller_display), DirtyLabel(self.display_label)]
+
         # ================= SETTINGS PANEL =================
         panel = tk.Frame(self.root, bg="#111", bd=2, relief="ridge")
         panel.pack(pady=20, padx=20)
@@ -78,6 +184,7 @@ class ShotClock:
         self.alert_time      = self.create_entry(panel, "Alert At", "10", 3, numeric=True)
         self.normal_color    = self.create_entry(panel, "Normal Color", "white", 4)
         self.alert_color     = self.create_entry(panel, "Alert Color", "red", 5)
+        self.tenths_below    = self.create_entry(panel, "Tenths Below", "0", 7, numeric=True)
 
         self.btn_pick_normal = tk.Button(panel, text="Pick Normal Color", command=self.choose_normal_color)
         self.btn_pick_normal.grid(row=4, column=2, padx=10)
@@ -110,6 +217,16 @@ class ShotClock:
         self.create_button(controls, "RESET (X)", self.reset, 3)
         self.create_button(controls, "EXTEND (SPACE)", self.add_extension, 4)
 
+        self.setting_entries = {
+            "start_game_value": self.start_game_value,
+            "shot_duration": self.shot_duration,
+            "extension": self.extension,
+            "alert_at": self.alert_time,
+            "tenths_below": self.tenths_below,
+            "normal_color": self.normal_color,
+            "alert_color": self.alert_color
+        }
+
         # ================= EDITABLE WIDGETS =================
         self.edit_widgets = [
             self.start_game_value,
@@ -118,18 +235,51 @@ class ShotClock:
             self.alert_time,
             self.normal_color,
             self.alert_color,
+            self.tenths_below,
             self.btn_pick_normal,
             self.btn_pick_alert,
             self.btn_sound
         ]
 
+        # ================= PERF OVERLAY =================
+        self.overlay = tk.Label(self.root, font=FONT_OVERLAY, fg="#0f0", bg="black", justify="left")
+        self.overlay_id = None
+        if self.perf.enabled:
+            self.show_overlay()
+
         # ================= HOTKEYS =================
-        self.root.bind_all("<s>", lambda e: self.start())
-        self.root.bind_all("<p>", lambda e: self.pause())
-        self.root.bind_all("<x>", lambda e: self.reset())
-        self.root.bind_all("<space>", lambda e: self.add_extension())
-        self.root.bind_all("<g>", lambda e: self.start_game())
-        self.root.bind_all("<Escape>", lambda e: self.root.destroy())
+        self.root.bind_all("<s>", lambda e: self.hotkey(self.start))
+        self.root.bind_all("<p>", lambda e: self.hotkey(self.pause))
+        self.root.bind_all("<x>", lambda e: self.hotkey(self.reset))
+        self.root.bind_all("<space>", lambda e: self.hotkey(self.add_extension))
+        self.root.bind_all("<g>", lambda e: self.hotkey(self.start_game))
+        self.root.bind_all("<F12>", lambda e: self.toggle_perf())
+        self.root.bind_all("<Escape>", lambda e: self.quit())
+
+        # ================= REMOTE CONTROL =================
+        self.remote = None
+        self.pump_id = None
+        if control:
+            self.dispatcher = shotclock_remote.CommandDispatcher()
+            host, port, path = control
+            try:
+                self.remote = shotclock_remote.CommandServer(
+                    self.engine, self, self.dispatcher, host, port, path).start()
+            except Exception as e:
+                messagebox.showwarning("Remote Control", "Remote control disabled:\n%s" % e)
+            else:
+                self.pump_commands()
+
+        # ================= JOURNAL =================
+        self.recorder = None
+        if journal:
+            try:
+                if shotclock_journal.restore_latest(self.engine, journal):
+                    self.fill_entries(self.engine.settings.as_dict())
+                self.recorder = shotclock_journal.open_session(self.engine, journal)
+            except OSError as e:
+                messagebox.showwarning("Journal", "Journal disabled:\n%s" % e)
+        self.root.protocol("WM_DELETE_WINDOW", self.quit)
 
         self.start_game_value.focus_set()
         self.root.mainloop()
@@ -176,6 +326,61 @@ class ShotClock:
             w.config(state="normal")
         self.mode_label.config(text="EDIT MODE", fg="yellow")
 
+    # ================= SETTINGS =================
+    # Entries are read and validated once per action while editing is
+    # unlocked; while the clock runs only the snapshot is used.
+    def resolve_color(self, name):
+        r, g, b = self.root.winfo_rgb(name)
+        return "#%02x%02x%02x" % (r >> 8, g >> 8, b >> 8)
+
+    def read_settings(self):
+        raw = {name: entry.get() for name, entry in self.setting_entries.items()}
+        raw["tenths_below"] = raw["tenths_below"] or "0"
+        settings = Settings.parse(**raw)
+        try:
+            return settings.replace(
+                normal_color=self.resolve_color(settings.normal_color),
+                alert_color=self.resolve_color(settings.alert_color)
+            )
+        except tk.TclError as e:
+            raise ValueError(str(e))
+
+    def snapshot_settings(self, interactive=True):
+        # Remote callers pass interactive=False and get the ValueError back
+        # instead of a modal dialog on the operator's screen
+        if self.engine.running:
+            return True
+        try:
+            settings = self.read_settings()
+        except ValueError as e:
+            if not interactive:
+                raise
+            messagebox.showerror("Settings", str(e).capitalize())
+            return False
+        if settings != self.engine.settings:
+            self.engine.configure(settings)
+        return True
+
+    def update_settings(self, values):
+        # Remote settings go through the entries so they stay the source of truth
+        if self.engine.running:
+            raise ValueError("settings are locked while the clock is running")
+        changes = shotclock_remote.parse_settings(values)
+        try:
+            for name in ("normal_color", "alert_color"):
+                if name in changes:
+                    self.resolve_color(changes[name])
+        except tk.TclError as e:
+            raise ValueError(str(e))
+        self.fill_entries(changes)
+        self.engine.configure(self.read_settings())
+
+    def fill_entries(self, values):
+        for name, value in values.items():
+            entry = self.setting_entries[name]
+            entry.delete(0, tk.END)
+            entry.insert(0, str(value))
+
     # ================= COLORS =================
     def choose_normal_color(self):
         c = colorchooser.askcolor()[1]
@@ -191,79 +396,470 @@ class ShotClock:
 
     # ================= SOUND =================
     def select_alert_file(self):
-        self.alert_file_path = filedialog.askopenfilename(
+        path = filedialog.askopenfilename(
             filetypes=(("WAV files", "*.wav"),)
         )
+        # Cancelling the dialog goes back to the built-in beep
+        try:
+            self.audio.load_alert(path or None)
+        except (OSError, EOFError, wave.Error) as e:
+            messagebox.showerror("Alert Sound", "Could not load %s:\n%s" % (path, e))
 
     def play_alert_sound(self):
-        if not self.buzzer_enabled.get():
-            return
-        if self.alert_file_path:
-            winsound.PlaySound(self.alert_file_path, winsound.SND_ASYNC)
-        else:
-            winsound.Beep(1200, 150)
+        if self.buzzer_enabled.get():
+            self.audio.alert()
 
     # ================= TIMER =================
     def update_timer(self):
-        if self.running and self.time_left > 0:
-            self.time_left -= 1
-            self.update_display()
-            if self.time_left <= int(self.alert_time.get()):
-                self.play_alert_sound()
-            self.timer_id = self.root.after(1000, self.update_timer)
-        else:
-            self.running = False
+        if self.timer_due is not None:
+            self.perf.record("lateness", time.monotonic() - self.timer_due)
+            self.timer_due = None
+        self.timer_id = None
+        delay = self.engine.tick()
+        if delay is not None:
+            ms = int(delay * 1000) + 1
+            self.timer_due = time.monotonic() + ms / 1000
+            self.timer_id = self.root.after(ms, self.update_timer)
+
+    def cancel_timer(self):
+        self.timer_due = None
+        if self.timer_id:
+            self.root.after_cancel(self.timer_id)
             self.timer_id = None
-            self.unlock_editing()
 
     def update_display(self):
-        val = str(self.time_left)
-        alert = int(self.alert_time.get())
-        color = self.alert_color.get() if self.time_left <= alert else self.normal_color.get()
-        self.controller_display.config(text=val, fg=color)
-        self.display_label.config(text=val, fg=color)
+        text = self.engine.text
+        color = self.engine.color()
+        self.display_fit.show(self.engine.settings, text)
+        if not self.perf.enabled:
+            for renderer in self.renderers:
+                renderer.show(text, color)
+            return
+        # Force the redraw now so its cost lands inside the measurement
+        t0 = time.perf_counter()
+        changed = [renderer.show(text, color) for renderer in self.renderers]
+        if any(changed):
+            self.root.update_idletasks()
+            self.perf.record("render", time.perf_counter() - t0)
+
+    def on_engine_event(self, event, engine):
+        if event == "alert":
+            self.play_alert_sound()
+            return
+        if event == "start":
+            self.lock_editing()
+            self.mode_label.config(text="HOTKEY MODE", fg="lime")
+            self.cancel_timer()
+            self.update_timer()
+        elif event == "extend" and engine.running:
+            self.cancel_timer()
+            self.update_timer()
+        elif event in ("pause", "reset", "start_game", "expire"):
+            self.cancel_timer()
+            self.unlock_editing()
+        self.update_display()
+
+    # ================= PERF =================
+    def hotkey(self, action):
+        if not self.perf.enabled:
+            action()
+            return
+        t0 = time.perf_counter()
+        action()
+        # Idle callbacks queued now run after Tk's pending redraws
+        self.root.after_idle(lambda: self.perf.record("input_to_paint", time.perf_counter() - t0))
+
+    def toggle_perf(self):
+        if self.perf.toggle():
+            self.show_overlay()
+        else:
+            self.cancel_overlay()
+            self.overlay.pack_forget()
+
+    def show_overlay(self):
+        self.overlay.pack(side="bottom", anchor="w", padx=10, pady=5)
+        self.refresh_overlay()
+
+    def refresh_overlay(self):
+        # Only one refresh chain, however often the overlay is toggled
+        self.cancel_overlay()
+        if not self.perf.enabled:
+            return
+        self.overlay.config(text=self.perf.overlay_text())
+        self.overlay_id = self.root.after(OVERLAY_MS, self.refresh_overlay)
+
+    def cancel_overlay(self):
+        if self.overlay_id:
+            self.root.after_cancel(self.overlay_id)
+            self.overlay_id = None
 
     # ================= ACTIONS =================
+    def start_game(self, interactive=True):
+        if self.snapshot_settings(interactive):
+            self.engine.start_game()
+
+    def start(self, interactive=True):
+        if self.snapshot_settings(interactive):
+            self.engine.start()
+
+    def pause(self, interactive=True):
+        self.engine.pause()
+
+    def reset(self, interactive=True):
+        if self.snapshot_settings(interactive):
+            self.engine.reset()
+
+    def add_extension(self, interactive=True):
+        if self.snapshot_settings(interactive):
+            self.engine.add_extension()
+
+    def pump_commands(self):
+        self.dispatcher.drain()
+        delay = shotclock_remote.POLL_MS if self.remote.handlers else shotclock_remote.IDLE_POLL_MS
+        self.pump_id = self.root.after(delay, self.pump_commands)
+
+    def quit(self):
+        self.cancel_timer()
+        self.cancel_overlay()
+        if self.pump_id:
+            self.root.after_cancel(self.pump_id)
+        if self.remote:
+            self.remote.close()
+        if self.recorder:
+            self.recorder.close()
+        if any(h.count for h in self.perf.histograms.values()):
+            try:
+                self.perf.export(self.perf_path)
+            except OSError as e:
+                messagebox.showwarning("Performance", "Timing data not exported:\n%s" % e)
+        self.audio.close()
+        if self.publisher:
+            self.publisher.close()
+        self.root.destroy()
+
+    def exit_entry_mode(self, event=None):
+        self.root.focus_set()
+        self.mode_label.config(text="HOTKEY MODE", fg="lime")
+
+# ================= MULTI-TABLE MODE =================
+class TableView:
+    # One clock in multi-table mode: a display Toplevel plus a dashboard row
+    def __init__(self, app, index, parent):
+        self.app = app
+        self.index = index
+        self.name = "Table %d" % (index + 1)
+        self.engine = ShotClockEngine(settings=app.settings)
+        self.engine.subscribe(self.on_engine_event)
+
+        self.display_window = tk.Toplevel(app.root)
+        self.display_window.iconbitmap(resource_path("sba_shotclock.ico"))
+        self.display_window.title("Shot Clock Display - %s" % self.name)
+        self.display_window.configure(bg="black")
+        self.display_window.geometry("640x400")
+        self.display_window.protocol("WM_DELETE_WINDOW", self.display_window.withdraw)
+        label = tk.Label(self.display_window, text=self.engine.text, font=FONT_MAIN, fg="white", bg="black")
+        label.pack(expand=True, fill="both")
+        self.display_fit = AutoFit(label)
+        self.display_fit.show(self.engine.settings, self.engine.text)
+
+        row = index + 1
+        self.row_widgets = [
+            tk.Label(parent, text=self.name, fg="white", bg="#111", font=FONT_LABEL, width=10, anchor="w"),
+            tk.Label(parent, text=self.engine.text, fg="white", bg="#111", font=FONT_TABLE, width=4),
+            tk.Label(parent, text="PAUSED", fg="yellow", bg="#111", font=FONT_LABEL, width=8)
+        ]
+        for col, widget in enumerate(self.row_widgets):
+            widget.grid(row=row, column=col, sticky="nsew", padx=2, pady=1)
+            widget.bind("<Button-1>", lambda e: app.select(self.index))
+        for col, (text, cmd) in enumerate((
+            ("G", self.start_game), ("S", self.start), ("P", self.pause),
+            ("X", self.reset), ("EXT", self.add_extension), ("Show", self.show_display)
+        ), start=len(self.row_widgets)):
+            tk.Button(parent, text=text, font=FONT_BTN, width=4, command=cmd)\
+                .grid(row=row, column=col, padx=1, pady=1)
+
+        self.renderers = [DirtyLabel(label), DirtyLabel(self.row_widgets[1])]
+        self.status = DirtyLabel(self.row_widgets[2])
+
+        self.publisher = None
+        if app.broadcast:
+            group, port = app.broadcast
+            self.publisher = shotclock_net.StatePublisher(self.engine, group, port + index)
+
+        app.scheduler.add(self.engine)
+
+        # Dashboard settings applied while this table was running; they take
+        # effect at its next start, reset or start game
+        self.pending = None
+        self.restored = None
+        self.recorder = None
+        self.journal_error = None
+        if app.journal:
+            name = "table-%d" % (index + 1)
+            try:
+                self.restored = shotclock_journal.restore_latest(self.engine, app.journal, name)
+                self.recorder = shotclock_journal.open_session(self.engine, app.journal, name)
+            except OSError as e:
+                self.journal_error = e
+
+    def on_engine_event(self, event, engine):
+        if event == "alert":
+            self.app.play_alert_sound()
+            return
+        text, color = engine.text, engine.color()
+        self.display_fit.show(engine.settings, text)
+        for renderer in self.renderers:
+            renderer.show(text, color)
+        if engine.running:
+            self.status.show("RUNNING", "lime")
+        elif engine.remaining <= 0:
+            self.status.show("EXPIRED", "red")
+        else:
+            self.status.show("PAUSED", "yellow")
+
+    def highlight(self, selected):
+        bg = "#333" if selected else "#111"
+        for widget in self.row_widgets:
+            widget.config(bg=bg)
+
+    def show_display(self):
+        self.display_window.deiconify()
+        self.display_window.lift()
+
+    # Settings can only change while a table is stopped, like the single clock
+    def apply_pending(self):
+        if self.pending is not None:
+            self.engine.configure(self.pending)
+            self.pending = None
+
     def start_game(self):
-        self.running = False
-        if self.timer_id:
-            self.root.after_cancel(self.timer_id)
-            self.timer_id = None
-        self.time_left = int(self.start_game_value.get())
-        self.update_display()
-        self.unlock_editing()
+        self.apply_pending()
+        self.engine.start_game()
+        self.app.rearm()
 
     def start(self):
-        if not self.running:
-            self.running = True
-            self.lock_editing()
-            self.mode_label.config(text="HOTKEY MODE", fg="lime")
-            if self.timer_id:
-                self.root.after_cancel(self.timer_id)
-            self.update_timer()
+        if not self.engine.running:
+            self.apply_pending()
+        self.engine.start()
+        self.app.rearm()
 
     def pause(self):
-        self.running = False
-        if self.timer_id:
-            self.root.after_cancel(self.timer_id)
-            self.timer_id = None
-        self.unlock_editing()
+        self.engine.pause()
+        self.app.rearm()
 
     def reset(self):
-        self.running = False
-        if self.timer_id:
-            self.root.after_cancel(self.timer_id)
-            self.timer_id = None
-        self.time_left = int(self.shot_duration.get())
-        self.update_display()
-        self.unlock_editing()
+        self.apply_pending()
+        self.engine.reset()
+        self.app.rearm()
 
     def add_extension(self):
-        self.time_left += int(self.extension.get())
-        self.update_display()
+        self.engine.add_extension()
+        self.app.rearm()
+
+    def close(self):
+        if self.publisher:
+            self.publisher.close()
+        if self.recorder:
+            self.recorder.close()
+
+class MultiTableApp:
+    # Hosts many clocks in one Tk root. A single Scheduler and a single
+    # after() chain drive every table.
+    def __init__(self, tables, broadcast=None, journal=None):
+        self.root = tk.Tk()
+        self.root.iconbitmap(resource_path("sba_shotclock.ico"))
+        self.root.title("Shot Clock Tables")
+        self.root.configure(bg="black")
 
-    def exit_entry_mode(self, event=None):
+        self.settings = Settings()
+        self.broadcast = broadcast
+        self.journal = journal
+        self.scheduler = Scheduler()
+        self.audio = AudioService()
+        self.timer_id = None
+        self.selected = 0
+
+        self.vcmd_number = (self.root.register(lambda v: v.isdigit() or v == ""), "%P")
+
+        # ================= SETTINGS STRIP =================
+        strip = tk.Frame(self.root, bg="#111", bd=2, relief="ridge")
+        strip.pack(fill="x", padx=10, pady=10)
+        self.setting_entries = {}
+        for col, (name, label) in enumerate((
+            ("start_game_value", "Start Game At"), ("shot_duration", "Shot Duration"),
+            ("extension", "Extension"), ("alert_at", "Alert At")
+        )):
+            tk.Label(strip, text=label, fg="white", bg="#111", font=FONT_LABEL)\
+                .grid(row=0, column=col * 2, padx=(10, 4), pady=6)
+            entry = tk.Entry(strip, font=FONT_LABEL, width=5, justify="center",
+                             validate="key", validatecommand=self.vcmd_number)
+            entry.insert(0, str(getattr(self.settings, name)))
+            entry.grid(row=0, column=col * 2 + 1)
+            entry.bind("<Return>", lambda e: self.apply_settings())
+            self.setting_entries[name] = entry
+        tk.Button(strip, text="Apply", font=FONT_BTN, command=self.apply_settings)\
+            .grid(row=0, column=8, padx=10)
+        self.buzzer_enabled = tk.BooleanVar(value=True)
+        tk.Checkbutton(strip, text="Enable Alerts", variable=self.buzzer_enabled, fg="white",
+                       bg="#111", selectcolor="#111", font=FONT_LABEL).grid(row=0, column=9, padx=10)
+
+        # ================= TABLE GRID =================
+        grid = tk.Frame(self.root, bg="black")
+        grid.pack(fill="both", expand=True, padx=10)
+        self.tables = [TableView(self, i, grid) for i in range(tables)]
+        self.select(0)
+
+        # One warning for all tables; they usually share the cause
+        failed = [table for table in self.tables if table.journal_error]
+        if failed:
+            messagebox.showwarning("Journal", "Journal disabled for %s:\n%s" % (
+                ", ".join(table.name for table in failed), failed[0].journal_error))
+
+        # A resumed session shows the settings it was journaled with; tables
+        # without a journal of their own follow the dashboard
+        restored = [table for table in self.tables if table.restored]
+        if restored:
+            self.settings = restored[0].engine.settings
+            self.fill_entries()
+            for table in self.tables:
+                if not table.restored:
+                    table.engine.configure(self.settings)
+
+        # ================= HOTKEYS =================
+        # Actions apply to the selected table; arrows or 1-9 change selection
+        self.root.bind_all("<s>", lambda e: self.current().start())
+        self.root.bind_all("<p>", lambda e: self.current().pause())
+        self.root.bind_all("<x>", lambda e: self.current().reset())
+        self.root.bind_all("<space>", lambda e: self.current().add_extension())
+        self.root.bind_all("<g>", lambda e: self.current().start_game())
+        self.root.bind_all("<Up>", lambda e: self.select(self.selected - 1))
+        self.root.bind_all("<Down>", lambda e: self.select(self.selected + 1))
+        for n in range(1, 10):
+            self.root.bind_all("<Key-%d>" % n, lambda e, n=n: self.select_key(e, n - 1))
+        self.root.bind_all("<Escape>", lambda e: self.quit())
+        self.root.protocol("WM_DELETE_WINDOW", self.quit)
+
+        self.root.mainloop()
+
+    def current(self):
+        return self.tables[self.selected]
+
+    def select(self, index):
+        if not 0 <= index < len(self.tables):
+            return
+        self.tables[self.selected].highlight(False)
+        self.selected = index
+        self.tables[index].highlight(True)
+
+    def select_key(self, event, index):
+        # Digits typed into the settings entries must not switch tables
+        if not isinstance(event.widget, tk.Entry):
+            self.select(index)
+
+    def apply_settings(self):
+        raw = {name: entry.get() for name, entry in self.setting_entries.items()}
+        try:
+            self.settings = self.settings.replace(**shotclock_remote.parse_settings(raw))
+        except ValueError as e:
+            messagebox.showerror("Settings", str(e).capitalize())
+            return
+        for table in self.tables:
+            if table.engine.running:
+                table.pending = self.settings
+            else:
+                table.pending = None
+                table.engine.configure(self.settings)
         self.root.focus_set()
-        self.mode_label.config(text="HOTKEY MODE", fg="lime")
 
-ShotClock()
+    def fill_entries(self):
+        for name, entry in self.setting_entries.items():
+            entry.delete(0, tk.END)
+            entry.insert(0, str(getattr(self.settings, name)))
+
+    def play_alert_sound(self):
+        if self.buzzer_enabled.get():
+            self.audio.alert()
+
+    # ================= SHARED TIMER =================
+    def rearm(self):
+        if self.timer_id:
+            self.root.after_cancel(self.timer_id)
+            self.timer_id = None
+        delay = self.scheduler.next_delay()
+        if delay is not None:
+            self.timer_id = self.root.after(int(delay * 1000) + 1, self.wake)
+
+    def wake(self):
+        self.timer_id = None
+        self.scheduler.run_due()
+        self.rearm()
+
+    def quit(self):
+        if self.timer_id:
+            self.root.after_cancel(self.timer_id)
+        for table in self.tables:
+            table.close()
+        self.audio.close()
+        self.root.destroy()
+
+def parse_address(value):
+    host, _, port = value.rpartition(":")
+    if not host:
+        host, port = value or shotclock_net.DEFAULT_GROUP, ""
+    try:
+        return host, int(port) if port else shotclock_net.DEFAULT_PORT
+    except ValueError:
+        raise argparse.ArgumentTypeError("expected GROUP[:PORT], got %r" % value)
+
+def parse_control(value):
+    if "/" in value or "\\" in value:
+        if not hasattr(socket, "AF_UNIX"):
+            raise argparse.ArgumentTypeError("socket paths are not supported on this platform, use [HOST:]PORT")
+        return None, None, value
+    host, _, port = value.rpartition(":")
+    try:
+        port = int(port) if port else shotclock_remote.DEFAULT_PORT
+    except ValueError:
+        raise argparse.ArgumentTypeError("expected [HOST:]PORT or a socket path, got %r" % value)
+    if not 0 <= port <= 65535:
+        raise argparse.ArgumentTypeError("port must be between 0 and 65535, got %d" % port)
+    return host or shotclock_remote.DEFAULT_HOST, port, None
+
+def main():
+    parser = argparse.ArgumentParser(description="SBA shot clock")
+    parser.add_argument(
+        "--broadcast", nargs="?", const="", type=parse_address, metavar="GROUP[:PORT]",
+        help="send clock state to remote displays (default group 239.255.42.99:5995)"
+    )
+    parser.add_argument(
+        "--control", nargs="?", const="", type=parse_control, metavar="[HOST:]PORT|PATH",
+        help="accept JSON-line commands over TCP (default 127.0.0.1:5990) or a Unix socket"
+    )
+    parser.add_argument(
+        "--tables", type=int, default=0, metavar="N",
+        help="run N independent clocks from one operator dashboard"
+    )
+    parser.add_argument(
+        "--journal", default=shotclock_journal.default_directory(), metavar="DIR",
+        help="where event journals are kept and resumed from (default: %(default)s)"
+    )
+    parser.add_argument("--no-journal", action="store_true", help="do not record or resume")
+    parser.add_argument(
+        "--perf", nargs="?", const="", metavar="FILE",
+        help="record timing histograms from startup (F12 toggles at runtime) and export "
+             "them at exit to FILE (.csv or .json; default: a dated .json in %s)"
+             % os.path.dirname(default_path())
+    )
+    args = parser.parse_args()
+    journal = None if args.no_journal else args.journal
+    if args.tables > 0:
+        if args.control:
+            parser.error("--control is not available in multi-table mode")
+        if args.perf is not None:
+            parser.error("--perf is not available in multi-table mode")
+        MultiTableApp(args.tables, broadcast=args.broadcast, journal=journal)
+    else:
+        ShotClock(broadcast=args.broadcast, control=args.control, journal=journal, perf=args.perf)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,196 @@
+import array
+import io
+import math
+import os
+import shutil
+import subprocess
+import sys
+import threading
+import time
+import wave
+
+BEEP_FREQ = 1200
+BEEP_MS = 150
+SAMPLE_RATE = 44100
+
+
+# ================= BUFFERS =================
+def synth_beep(freq=BEEP_FREQ, ms=BEEP_MS, rate=SAMPLE_RATE, volume=0.5):
+    # Same tone winsound.Beep(1200, 150) used to make, as an in-memory WAV
+    count = int(rate * ms / 1000)
+    fade = max(1, int(rate * 0.005))
+    peak = 32767 * volume
+    samples = array.array("h", bytes(2 * count))
+    for i in range(count):
+        env = min(1.0, i / fade, (count - i) / fade)
+        samples[i] = int(peak * env * math.sin(2 * math.pi * freq * i / rate))
+    if sys.byteorder == "big":
+        samples.byteswap()
+    return wav_bytes(samples.tobytes(), rate, channels=1, width=2)
+
+
+def wav_bytes(frames, rate, channels, width):
+    out = io.BytesIO()
+    with wave.open(out, "wb") as w:
+        w.setnchannels(channels)
+        w.setsampwidth(width)
+        w.setframerate(rate)
+        w.writeframes(frames)
+    return out.getvalue()
+
+
+def load_wav(path):
+    # Decode once and re-encode as a clean PCM WAV held in memory.
+    # Raises wave.Error / EOFError / OSError for unusable files.
+    with wave.open(path, "rb") as w:
+        params = w.getparams()
+        frames = w.readframes(params.nframes)
+    return wav_bytes(frames, params.framerate, params.nchannels, params.sampwidth)
+
+
+# ================= BACKENDS =================
+class NullBackend:
+    # Plays nothing; keeps a record of what would have been played
+    def __init__(self):
+        self.played = []
+
+    def play(self, data):
+        self.played.append((time.monotonic(), len(data)))
+
+    def close(self):
+        pass
+
+
+class FileSinkBackend:
+    # Writes every played buffer to a numbered WAV file in a directory
+    def __init__(self, directory):
+        self.directory = directory
+        self.count = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def play(self, data):
+        self.count += 1
+        path = os.path.join(self.directory, "alert-%06d.wav" % self.count)
+        with open(path, "wb") as f:
+            f.write(data)
+
+    def close(self):
+        pass
+
+
+class WinsoundBackend:
+    def __init__(self):
+        import winsound
+        self.winsound = winsound
+
+    def play(self, data):
+        # SND_MEMORY cannot be async; the worker thread absorbs the wait
+        self.winsound.PlaySound(data, self.winsound.SND_MEMORY)
+
+    def close(self):
+        self.winsound.PlaySound(None, 0)
+
+
+class CommandBackend:
+    # Pipes the WAV buffer into an external player reading from stdin
+    PLAYERS = (
+        ("aplay", ["aplay", "-q", "-"]),
+        ("paplay", ["paplay"]),
+        ("ffplay", ["ffplay", "-nodisp", "-autoexit", "-loglevel", "quiet", "-"]),
+    )
+
+    def __init__(self, command):
+        self.command = command
+
+    @classmethod
+    def detect(cls):
+        for name, command in cls.PLAYERS:
+            if shutil.which(name):
+                return cls(command)
+        return None
+
+    def play(self, data):
+        subprocess.run(
+            self.command, input=data,
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+
+    def close(self):
+        pass
+
+
+def default_backend():
+    if sys.platform == "win32":
+        try:
+            return WinsoundBackend()
+        except ImportError:
+            pass
+    return CommandBackend.detect() or NullBackend()
+
+
+# ================= SERVICE =================
+class AudioService:
+    # Plays alerts on a background worker so the Tk thread never waits on
+    # audio. Only one alert can be pending: alerts requested while another
+    # is still waiting are coalesced into it.
+    def __init__(self, backend=None):
+        self.backend = backend if backend is not None else default_backend()
+        self.beep = synth_beep()
+        self.alert_buffer = self.beep
+        self.pending = None
+        self.requested = 0
+        self.played = 0
+        self.coalesced = 0
+        self.last_latency = None
+        self.on_dispatch = None
+        self.closed = False
+        self.cond = threading.Condition()
+        self.worker = threading.Thread(target=self.run, name="shotclock-audio", daemon=True)
+        self.worker.start()
+
+    def load_alert(self, path):
+        self.alert_buffer = load_wav(path) if path else self.beep
+
+    def alert(self):
+        with self.cond:
+            self.requested += 1
+            if self.pending is not None:
+                self.coalesced += 1
+            else:
+                self.pending = time.monotonic()
+            self.cond.notify()
+
+    def run(self):
+        while True:
+            with self.cond:
+                while self.pending is None and not self.closed:
+                    self.cond.wait()
+                if self.closed:
+                    return
+                requested_at = self.pending
+                self.pending = None
+                data = self.alert_buffer
+            self.last_latency = time.monotonic() - requested_at
+            if self.on_dispatch:
+                self.on_dispatch(self.last_latency)
+            try:
+                self.backend.play(data)
+            except Exception:
+                pass
+            self.played += 1
+
+    def wait_idle(self, timeout=None):
+        # Used by tooling to wait until queued alerts have been handed off
+        end = None if timeout is None else time.monotonic() + timeout
+        while self.pending is not None or self.played + self.coalesced < self.requested:
+            if end is not None and time.monotonic() > end:
+                return False
+            time.sleep(0.001)
+        return True
+
+    def close(self):
+        with self.cond:
+            self.closed = True
+            self.cond.notify()
+        self.worker.join(timeout=1)
+        self.backend.close()
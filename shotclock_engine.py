@@ -0,0 +1,292 @@
+import dataclasses
+import heapq
+import itertools
+import math
+import time
+from dataclasses import dataclass
+
+TICK = 1.0
+TENTH = 0.1
+# Scheduler wakeups are rounded up to this grid so tables whose display
+# boundaries fall close together are ticked in one wakeup
+GRANULARITY = 0.02
+
+# Rounding guard so float deadlines like 29.0000000001 still read as 29
+EPS_DIGITS = 6
+
+
+def whole_seconds(remaining):
+    return math.ceil(round(remaining, EPS_DIGITS))
+
+
+def whole_tenths(remaining):
+    return math.ceil(round(remaining * 10, EPS_DIGITS)) / 10
+
+
+# ================= SETTINGS =================
+@dataclass(frozen=True)
+class Settings:
+    start_game_value: int = 40
+    shot_duration: int = 30
+    extension: int = 15
+    alert_at: int = 10
+    tenths_below: int = 0
+    normal_color: str = "white"
+    alert_color: str = "red"
+
+    NUMERIC = ("start_game_value", "shot_duration", "extension", "alert_at", "tenths_below")
+
+    @classmethod
+    def parse(cls, **raw):
+        # Validate raw entry strings once; raises ValueError naming the field
+        values = {}
+        for name, value in raw.items():
+            if name not in cls.__dataclass_fields__:
+                raise ValueError("unknown setting %s" % name)
+            if name in cls.NUMERIC:
+                value = str(value).strip()
+                if not value.isdigit():
+                    raise ValueError("%s must be a whole number of seconds" % name.replace("_", " "))
+                value = int(value)
+            elif not str(value).strip():
+                raise ValueError("%s must not be empty" % name.replace("_", " "))
+            values[name] = value
+        return cls(**values)
+
+    def replace(self, **changes):
+        return dataclasses.replace(self, **changes)
+
+    def as_dict(self):
+        return dataclasses.asdict(self)
+
+
+# ================= TIME SOURCES =================
+class VirtualClock:
+    # Stand-in for time.monotonic() that only moves when told to
+    def __init__(self, start=0.0):
+        self.now = start
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+        return self.now
+
+
+# ================= ENGINE =================
+class ShotClockEngine:
+    # Events passed to observers as callback(event, engine):
+    #   start, pause, reset, start_game, extend, settings, restore,
+    #   tick (displayed value changed), alert (whole second passed inside
+    #   the alert window), expire (reached zero)
+    def __init__(self, clock=time.monotonic, settings=None):
+        self.clock = clock
+        self.observers = []
+        self.settings = settings or Settings()
+
+        self.running = False
+        self.remaining = float(self.settings.start_game_value)
+        self.time_left = self.settings.start_game_value
+        self.deadline = None
+        self.text = self.format_time(self.remaining)
+
+    # ================= OBSERVERS =================
+    def subscribe(self, callback):
+        self.observers.append(callback)
+        return callback
+
+    def unsubscribe(self, callback):
+        if callback in self.observers:
+            self.observers.remove(callback)
+
+    def notify(self, event):
+        for callback in list(self.observers):
+            callback(event, self)
+
+    # ================= SETTINGS =================
+    def configure(self, settings=None, **changes):
+        if settings is None:
+            settings = self.settings
+        self.settings = settings.replace(**changes) if changes else settings
+        self.text = self.format_time(self.remaining)
+        self.notify("settings")
+
+    # ================= TIME =================
+    # Remaining time is derived from a monotonic deadline, never from a count
+    # of ticks, so late or jittery wakeups cannot accumulate into drift.
+    def current_remaining(self):
+        if self.running and self.deadline is not None:
+            return max(0.0, self.deadline - self.clock())
+        return self.remaining
+
+    def step_for(self, remaining):
+        # The step to the *next* displayed value: once the whole seconds
+        # reach the threshold, the next change is already a tenth away
+        return TENTH if whole_seconds(remaining) <= self.settings.tenths_below else TICK
+
+    def next_delay(self):
+        # Seconds until the displayed value next changes, None when stopped
+        if not self.running:
+            return None
+        remaining = self.current_remaining()
+        step = self.step_for(remaining)
+        delay = remaining - (math.ceil(round(remaining / step, EPS_DIGITS)) - 1) * step
+        return max(delay, 0.001)
+
+    def format_time(self, remaining):
+        if remaining > 0 and whole_tenths(remaining) < self.settings.tenths_below:
+            return "%.1f" % whole_tenths(remaining)
+        return str(whole_seconds(remaining))
+
+    def in_alert(self):
+        return self.time_left <= self.settings.alert_at
+
+    def color(self):
+        return self.settings.alert_color if self.in_alert() else self.settings.normal_color
+
+    def state(self):
+        return {
+            "text": self.text,
+            "remaining": round(self.current_remaining(), 1),
+            "running": self.running,
+            "alert": self.in_alert(),
+            "color": self.color(),
+            "normal_color": self.settings.normal_color,
+            "alert_color": self.settings.alert_color,
+        }
+
+    def tick(self):
+        if not self.running:
+            return None
+        self.remaining = self.current_remaining()
+        previous = self.time_left
+        self.time_left = whole_seconds(self.remaining)
+        text = self.format_time(self.remaining)
+        if text != self.text:
+            self.text = text
+            self.notify("tick")
+        if self.time_left < previous and self.in_alert():
+            self.notify("alert")
+        if self.remaining <= 0:
+            self.running = False
+            self.deadline = None
+            self.remaining = 0.0
+            self.notify("expire")
+            return None
+        return self.next_delay()
+
+    def set_time(self, seconds):
+        self.remaining = float(seconds)
+        self.time_left = whole_seconds(self.remaining)
+        self.text = self.format_time(self.remaining)
+
+    # ================= ACTIONS =================
+    def start_game(self):
+        self.running = False
+        self.deadline = None
+        self.set_time(self.settings.start_game_value)
+        self.notify("start_game")
+
+    def start(self):
+        if self.running or self.remaining <= 0:
+            return
+        self.running = True
+        self.deadline = self.clock() + self.remaining
+        self.notify("start")
+
+    def pause(self):
+        if self.running:
+            # Keep the partial second so resuming does not lose it
+            self.remaining = self.current_remaining()
+        self.running = False
+        self.deadline = None
+        self.notify("pause")
+
+    def reset(self):
+        self.running = False
+        self.deadline = None
+        self.set_time(self.settings.shot_duration)
+        self.notify("reset")
+
+    def restore(self, settings, remaining):
+        # Bring back a journaled state; always paused
+        self.running = False
+        self.deadline = None
+        self.settings = settings
+        self.set_time(remaining)
+        self.notify("restore")
+
+    def add_extension(self):
+        if self.running:
+            self.deadline += self.settings.extension
+            self.remaining = self.current_remaining()
+        else:
+            self.remaining += self.settings.extension
+        self.time_left = whole_seconds(self.remaining)
+        self.text = self.format_time(self.remaining)
+        self.notify("extend")
+
+
+# ================= SCHEDULER =================
+class Scheduler:
+    # One timer for many engines. Each running engine has a single live heap
+    # entry at the time its display next changes; entries made stale by
+    # pause/reset/extend are skipped using a per-engine generation number.
+    def __init__(self, clock=time.monotonic, granularity=GRANULARITY):
+        self.clock = clock
+        self.granularity = granularity
+        self.heap = []
+        self.generation = {}
+        self.counter = itertools.count()
+        self.wakeups = 0
+        self.ticks = 0
+
+    def add(self, engine):
+        self.generation[engine] = 0
+        engine.subscribe(self.on_engine_event)
+        self.schedule(engine)
+
+    def remove(self, engine):
+        engine.unsubscribe(self.on_engine_event)
+        self.generation.pop(engine, None)
+
+    def on_engine_event(self, event, engine):
+        if event not in ("tick", "alert"):
+            self.schedule(engine)
+
+    def schedule(self, engine):
+        if engine not in self.generation:
+            return
+        generation = self.generation[engine] = self.generation[engine] + 1
+        delay = engine.next_delay()
+        if delay is None:
+            return
+        due = self.clock() + delay
+        if self.granularity:
+            due = math.ceil(due / self.granularity) * self.granularity
+        heapq.heappush(self.heap, (due, next(self.counter), generation, engine))
+
+    def next_delay(self):
+        # Seconds until the earliest live entry, None when nothing is running
+        heap = self.heap
+        while heap and heap[0][2] != self.generation.get(heap[0][3]):
+            heapq.heappop(heap)
+        if not heap:
+            return None
+        return max(0.0, heap[0][0] - self.clock())
+
+    def run_due(self):
+        now = self.clock()
+        heap = self.heap
+        ticked = 0
+        while heap and heap[0][0] <= now:
+            _, _, generation, engine = heapq.heappop(heap)
+            if generation != self.generation.get(engine):
+                continue
+            engine.tick()
+            self.schedule(engine)
+            ticked += 1
+        self.wakeups += 1
+        self.ticks += ticked
+        return ticked
@@ -0,0 +1,82 @@
+DIGITS = "0123456789"
+MIN_SIZE = 8
+MAX_SIZE = 4000
+# Share of the window the text may use, leaving a little border
+FILL = 0.95
+
+
+def sample_strings(settings, text=""):
+    # Widest strings the display can need for these settings: whole seconds
+    # up to a full shot plus one extension (or whatever is showing now, after
+    # repeated extensions), and tenths when they are enabled.
+    longest = max(settings.start_game_value, settings.shot_duration + settings.extension)
+    digits = max(len(str(longest)), len(text.partition(".")[0]))
+    samples = [DIGITS[0] * digits]
+    if settings.tenths_below > 0:
+        samples.append(DIGITS[0] * len(str(max(settings.tenths_below - 1, 0))) + ".0")
+    return tuple(samples)
+
+
+class FontFitter:
+    # Finds the largest pixel size whose text fits a box. measure(size, text)
+    # returns (width, height) in pixels for one font family and weight;
+    # results are memoized per box and per measured size, so repeated ticks
+    # and revisited window sizes never measure again.
+    def __init__(self, measure, min_size=MIN_SIZE, max_size=MAX_SIZE):
+        self.measure_font = measure
+        self.min_size = min_size
+        self.max_size = max_size
+        self.fits = {}
+        self.measured = {}
+        self.digit = None
+        self.measurements = 0
+
+    def measure(self, size, text):
+        key = (size, text)
+        result = self.measured.get(key)
+        if result is None:
+            result = self.measured[key] = self.measure_font(size, text)
+            self.measurements += 1
+        return result
+
+    def widest_digit(self):
+        # Digits are usually tabular, but pick the widest to be safe
+        if self.digit is None:
+            self.digit = max(DIGITS, key=lambda d: self.measure(100, d)[0])
+        return self.digit
+
+    def fit(self, width, height, samples):
+        key = (width, height, samples)
+        size = self.fits.get(key)
+        if size is None:
+            digit = self.widest_digit()
+            size = min(self.fit_one(width, height, s.replace(DIGITS[0], digit)) for s in samples)
+            self.fits[key] = size
+        return size
+
+    def fits_box(self, size, text, width, height):
+        w, h = self.measure(size, text)
+        return w <= width * FILL and h <= height
+
+    def fit_one(self, width, height, text):
+        # Font metrics scale almost linearly, so one reference measurement
+        # gives a close guess; a short binary search around it makes it exact.
+        ref = 100
+        w, h = self.measure(ref, text)
+        guess = int(ref * min(width * FILL / max(w, 1), height / max(h, 1)))
+        lo = max(self.min_size, min(self.max_size, int(guess * 0.9)))
+        hi = max(self.min_size, min(self.max_size, int(guess * 1.1) + 1))
+        while lo > self.min_size and not self.fits_box(lo, text, width, height):
+            hi, lo = lo, max(self.min_size, lo // 2)
+        while hi < self.max_size and self.fits_box(hi, text, width, height):
+            lo, hi = hi, min(self.max_size, hi * 2)
+        if self.fits_box(hi, text, width, height):
+            return hi
+        # Invariant: lo fits (or is the minimum), hi does not
+        while hi - lo > 1:
+            mid = (lo + hi) // 2
+            if self.fits_box(mid, text, width, height):
+                lo = mid
+            else:
+                hi = mid
+        return lo
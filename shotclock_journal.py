@@ -0,0 +1,351 @@
+import argparse
+import glob
+import itertools
+import json
+import os
+import queue
+import struct
+import sys
+import threading
+import time
+import zlib
+
+from shotclock_engine import Settings
+
+MAGIC = b"SBAJ\x01"
+SUFFIX = ".sbaj"
+# Sidecar holding the file offset of the last snapshot written, so resuming
+# replays only the tail. It is a hint: a missing or stale index falls back
+# to a full replay.
+INDEX_SUFFIX = ".idx"
+SNAPSHOT_EVERY = 256
+
+# Record: kind, event, monotonic time, wall time, remaining, running,
+# payload length, then the payload and a CRC32 over header and payload.
+# A torn or corrupt tail (crash mid-write) simply ends the replay there.
+RECORD = struct.Struct("<BBddd?H")
+CRC = struct.Struct("<I")
+
+KIND_EVENT = 1
+KIND_SNAPSHOT = 2
+
+EVENTS = ("start_game", "start", "pause", "reset", "extend", "settings", "tick", "expire", "restore", "close")
+EVENT_CODES = {name: code for code, name in enumerate(EVENTS)}
+
+
+def default_directory():
+    base = os.environ.get("APPDATA") or os.path.join(os.path.expanduser("~"), ".local", "share")
+    return os.path.join(base, "SBA Shotclock", "journal")
+
+
+def encode_record(kind, event, mono, wall, remaining, running, payload=b""):
+    header = RECORD.pack(kind, EVENT_CODES[event], mono, wall, remaining, running, len(payload))
+    return header + payload + CRC.pack(zlib.crc32(header + payload))
+
+
+def read_records(path, offset=None):
+    # Streams (kind, event, mono, wall, remaining, running, payload) tuples,
+    # from the start or from a record boundary at offset
+    with open(path, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            return
+        if offset:
+            f.seek(offset)
+        while True:
+            header = f.read(RECORD.size)
+            if len(header) < RECORD.size:
+                return
+            kind, code, mono, wall, remaining, running, size = RECORD.unpack(header)
+            payload = f.read(size)
+            crc = f.read(CRC.size)
+            if len(crc) < CRC.size or CRC.unpack(crc)[0] != zlib.crc32(header + payload):
+                return
+            if code >= len(EVENTS):
+                return
+            yield kind, EVENTS[code], mono, wall, remaining, running, payload
+
+
+# ================= WRITER =================
+class JournalWriter:
+    # Appends encoded records from a background thread. Everything queued
+    # while a write is in progress goes out in the next single write+fsync;
+    # after a batch holding a snapshot the index is pointed at it.
+    def __init__(self, path):
+        self.path = path
+        self.queue = queue.SimpleQueue()
+        self.batches = 0
+        self.records = 0
+        self.errors = 0
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.file = open(path, "ab")
+        if self.file.tell() == 0:
+            self.file.write(MAGIC)
+            self.file.flush()
+        self.thread = threading.Thread(target=self.run, name="shotclock-journal", daemon=True)
+        self.thread.start()
+
+    def append(self, data, snapshot=False):
+        self.queue.put((data, snapshot))
+
+    def run(self):
+        while True:
+            item = self.queue.get()
+            batch = []
+            while item is not None:
+                batch.append(item)
+                try:
+                    item = self.queue.get_nowait()
+                except queue.Empty:
+                    break
+            if batch:
+                try:
+                    offset = self.file.tell()
+                    snapshot_at = None
+                    for data, snapshot in batch:
+                        if snapshot:
+                            snapshot_at = offset
+                        offset += len(data)
+                    self.file.write(b"".join(data for data, _ in batch))
+                    self.file.flush()
+                    os.fsync(self.file.fileno())
+                    if snapshot_at is not None:
+                        self.write_index(snapshot_at)
+                except OSError:
+                    # A full or vanished disk must not stop the clock
+                    self.errors += 1
+                else:
+                    self.batches += 1
+                    self.records += len(batch)
+            if item is None:
+                self.file.close()
+                return
+
+    def write_index(self, offset):
+        # Not fsynced: after a crash an old or missing index only costs a
+        # longer replay, never a wrong one
+        index = self.path + INDEX_SUFFIX
+        with open(index + ".tmp", "w") as f:
+            f.write(str(offset))
+        os.replace(index + ".tmp", index)
+
+    def close(self):
+        self.queue.put(None)
+        self.thread.join(timeout=2)
+
+
+# ================= RECORDER =================
+class JournalRecorder:
+    # Turns engine events into journal records. Runs on the engine's thread
+    # and only encodes; the writer thread does the I/O.
+    def __init__(self, engine, writer, wall=time.time):
+        self.engine = engine
+        self.writer = writer
+        self.wall = wall
+        self.since_snapshot = 0
+        self.snapshot("restore")
+        engine.subscribe(self.on_engine_event)
+
+    def on_engine_event(self, event, engine):
+        if event not in EVENT_CODES:
+            return
+        if event == "settings" or self.since_snapshot >= SNAPSHOT_EVERY:
+            self.snapshot(event)
+            return
+        self.since_snapshot += 1
+        self.writer.append(encode_record(
+            KIND_EVENT, event, engine.clock(), self.wall(),
+            engine.current_remaining(), engine.running
+        ))
+
+    def snapshot(self, event):
+        engine = self.engine
+        payload = json.dumps(engine.settings.as_dict(), separators=(",", ":")).encode("utf-8")
+        self.since_snapshot = 0
+        self.writer.append(encode_record(
+            KIND_SNAPSHOT, event, engine.clock(), self.wall(),
+            engine.current_remaining(), engine.running, payload
+        ), snapshot=True)
+
+    def close(self):
+        self.engine.unsubscribe(self.on_engine_event)
+        self.on_engine_event("close", self.engine)
+        self.writer.close()
+
+
+def session_path(directory, name):
+    stamp = time.strftime("%Y%m%d-%H%M%S")
+    return os.path.join(directory, "%s-%s-%d%s" % (name, stamp, os.getpid(), SUFFIX))
+
+
+def open_session(engine, directory, name="clock"):
+    return JournalRecorder(engine, JournalWriter(session_path(directory, name)))
+
+
+# ================= RESUME =================
+def latest_session(directory, name="clock"):
+    paths = glob.glob(os.path.join(directory, "%s-*%s" % (name, SUFFIX)))
+    return max(paths, key=os.path.getmtime) if paths else None
+
+
+def read_index(path):
+    try:
+        with open(path + INDEX_SUFFIX) as f:
+            return int(f.read())
+    except (OSError, ValueError):
+        return None
+
+
+def load_state(path):
+    # Returns (settings, remaining) as of the last intact record, or None.
+    # Settings come from the last snapshot; the clock always comes back
+    # paused so the operator decides when play resumes. Replay starts at the
+    # indexed snapshot when it checks out, else at the top of the file.
+    offset = read_index(path)
+    if offset:
+        records = read_records(path, offset)
+        first = next(records, None)
+        if first and first[0] == KIND_SNAPSHOT:
+            state = replay_state(itertools.chain([first], records))
+            if state:
+                return state
+    return replay_state(read_records(path))
+
+
+def replay_state(records):
+    settings = None
+    remaining = None
+    for kind, event, mono, wall, rem, running, payload in records:
+        if kind == KIND_SNAPSHOT:
+            try:
+                settings = Settings(**json.loads(payload))
+            except (ValueError, TypeError):
+                continue
+        remaining = rem
+    if settings is None or remaining is None:
+        return None
+    return settings, remaining
+
+
+def restore_latest(engine, directory, name="clock"):
+    path = latest_session(directory, name)
+    state = load_state(path) if path else None
+    if state:
+        engine.restore(*state)
+    return state
+
+
+# ================= STATS =================
+class MatchStats:
+    def __init__(self, source, number):
+        self.source = source
+        self.number = number
+        self.shots = []
+        self.extensions = 0
+
+
+def scan_matches(paths):
+    # One streaming pass per journal. A match begins at start_game; a shot
+    # begins at start_game or reset and ends at the next one, expiry, or close.
+    for path in paths:
+        match = None
+        credited = None
+        ran = False
+        extension = Settings().extension
+        number = 0
+        last = None
+        for kind, event, mono, wall, remaining, running, payload in read_records(path):
+            # Time on the clock just before this event took effect
+            before = remaining
+            if last is not None:
+                before = last[1] - (mono - last[0]) if last[2] else last[1]
+            last = (mono, remaining, running)
+            if kind == KIND_SNAPSHOT:
+                try:
+                    extension = json.loads(payload).get("extension", extension)
+                except ValueError:
+                    pass
+            if event in ("start_game", "reset", "expire", "close") and credited is not None and ran and match:
+                match.shots.append(max(0.0, credited - max(0.0, before)))
+                credited = None
+            if event == "start_game":
+                if match and (match.shots or match.extensions):
+                    yield match
+                number += 1
+                match = MatchStats(path, number)
+            elif event == "restore" and match is None:
+                # A session resumed after a restart continues its match as "0"
+                match = MatchStats(path, 0)
+            if event in ("start_game", "reset"):
+                credited = remaining
+                ran = False
+            elif event == "start":
+                ran = True
+            elif event == "extend" and match:
+                match.extensions += 1
+                if credited is not None:
+                    credited += extension
+        if match and (match.shots or match.extensions):
+            yield match
+
+
+def percentile(values, pct):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))] if values else 0.0
+
+
+def print_stats(paths, out=sys.stdout):
+    histogram = {}
+    total_shots = 0
+    total_ext = 0
+    matches = 0
+    out.write("%-40s %5s %6s %8s %8s %8s %5s\n" % ("journal", "match", "shots", "mean", "median", "p90", "ext"))
+    for match in scan_matches(paths):
+        matches += 1
+        shots = match.shots
+        total_shots += len(shots)
+        total_ext += match.extensions
+        for shot in shots:
+            bucket = int(shot)
+            histogram[bucket] = histogram.get(bucket, 0) + 1
+        out.write("%-40s %5d %6d %8.1f %8.1f %8.1f %5d\n" % (
+            os.path.basename(match.source)[-40:], match.number, len(shots),
+            sum(shots) / len(shots) if shots else 0.0, percentile(shots, 50), percentile(shots, 90),
+            match.extensions
+        ))
+    out.write("\n%d matches, %d shots, %d extensions\n" % (matches, total_shots, total_ext))
+    if histogram:
+        peak = max(histogram.values())
+        out.write("\nshot time distribution (seconds used)\n")
+        for bucket in range(min(histogram), max(histogram) + 1):
+            count = histogram.get(bucket, 0)
+            out.write("%4d s %6d %s\n" % (bucket, count, "#" * int(50 * count / peak)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Shot clock journal tools")
+    sub = parser.add_subparsers(dest="command", required=True)
+    stats = sub.add_parser("stats", help="per-match shot time and extension statistics")
+    stats.add_argument("paths", nargs="*", help="journal files or directories (default: the app journal)")
+    dump = sub.add_parser("dump", help="print every record of one journal")
+    dump.add_argument("path")
+    args = parser.parse_args()
+
+    if args.command == "dump":
+        for kind, event, mono, wall, remaining, running, payload in read_records(args.path):
+            print("%s %-10s %12.3f %7.2f %-7s %s" % (
+                time.strftime("%H:%M:%S", time.localtime(wall)), event, mono, remaining,
+                "RUNNING" if running else "", payload.decode("utf-8")
+            ))
+        return
+
+    paths = []
+    for path in args.paths or [default_directory()]:
+        if os.path.isdir(path):
+            paths.extend(sorted(glob.glob(os.path.join(path, "*" + SUFFIX))))
+        else:
+            paths.append(path)
+    print_stats(paths)
+
+
+if __name__ == "__main__":
+    main()
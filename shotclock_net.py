@@ -0,0 +1,225 @@
+import argparse
+import json
+import os
+import socket
+import struct
+import threading
+import time
+
+DEFAULT_GROUP = "239.255.42.99"
+DEFAULT_PORT = 5995
+SNAPSHOT_INTERVAL = 1.0
+MAX_DATAGRAM = 4096
+
+# Wire format: one compact JSON object per UDP datagram
+#   {"s": seq, "f": session, "ts": wall time, ...all fields}   full snapshot
+#   {"s": seq, "ts": wall time, ...changed fields}             delta
+# Fields hold absolute values, so a lost delta only leaves a display stale
+# until the next periodic snapshot.
+
+
+def encode(message):
+    return json.dumps(message, separators=(",", ":")).encode("utf-8")
+
+
+# ================= PUBLISHER =================
+class StatePublisher:
+    # Sends every engine state change to the multicast group (or any extra
+    # unicast destinations) and repeats a full snapshot for late joiners.
+    def __init__(self, engine, group=DEFAULT_GROUP, port=DEFAULT_PORT, interface="0.0.0.0",
+                 ttl=1, destinations=(), snapshot_interval=SNAPSHOT_INTERVAL):
+        self.engine = engine
+        self.destinations = [(group, port)] if group else []
+        self.destinations.extend(destinations)
+        self.snapshot_interval = snapshot_interval
+        self.session = int.from_bytes(os.urandom(4), "big") or 1
+        self.seq = 0
+        self.sent = 0
+        self.state = {}
+        self.last_snapshot = 0.0
+        self.lock = threading.Lock()
+        self.stopped = threading.Event()
+
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_UDP)
+        self.sock.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_TTL, ttl)
+        self.sock.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_IF, socket.inet_aton(interface))
+        self.sock.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_LOOP, 1)
+        self.sock.setblocking(False)
+
+        engine.subscribe(self.on_engine_event)
+        self.publish(full=True)
+        self.thread = threading.Thread(target=self.run, name="shotclock-publisher", daemon=True)
+        self.thread.start()
+
+    def on_engine_event(self, event, engine):
+        if event != "alert":
+            self.publish()
+
+    def publish(self, full=False):
+        state = self.engine.state()
+        with self.lock:
+            if full or time.monotonic() - self.last_snapshot >= self.snapshot_interval:
+                self.send_locked(state, full=True)
+            else:
+                delta = {k: v for k, v in state.items() if self.state.get(k) != v}
+                if delta:
+                    self.send_locked(delta, full=False)
+            self.state.update(state)
+
+    def send_locked(self, fields, full):
+        self.seq += 1
+        message = {"s": self.seq, "ts": time.time()}
+        if full:
+            message["f"] = self.session
+            self.last_snapshot = time.monotonic()
+        message.update(fields)
+        data = encode(message)
+        for dest in self.destinations:
+            try:
+                self.sock.sendto(data, dest)
+                self.sent += 1
+            except OSError:
+                # A full socket buffer or missing route must never reach the UI
+                pass
+
+    def run(self):
+        # Keeps snapshots flowing while the clock sits idle. It only resends
+        # the cached state so the engine is never touched off the Tk thread.
+        while not self.stopped.wait(self.snapshot_interval):
+            with self.lock:
+                if time.monotonic() - self.last_snapshot >= self.snapshot_interval:
+                    self.send_locked(dict(self.state), full=True)
+
+    def close(self):
+        self.engine.unsubscribe(self.on_engine_event)
+        self.stopped.set()
+        self.thread.join(timeout=1)
+        self.sock.close()
+
+
+# ================= RECEIVER =================
+class StateReceiver:
+    def __init__(self, group=DEFAULT_GROUP, port=DEFAULT_PORT, interface="0.0.0.0", timeout=0.5):
+        self.state = {}
+        self.session = None
+        self.seq = 0
+        self.synced = False
+        self.gaps = 0
+        self.received = 0
+        self.latency = None
+
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_UDP)
+        self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        if hasattr(socket, "SO_REUSEPORT"):
+            self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        self.sock.bind(("", port))
+        if group:
+            membership = struct.pack("4s4s", socket.inet_aton(group), socket.inet_aton(interface))
+            self.sock.setsockopt(socket.IPPROTO_IP, socket.IP_ADD_MEMBERSHIP, membership)
+        self.sock.settimeout(timeout)
+
+    def apply(self, message):
+        # Returns True when the visible state may have changed
+        seq = message.pop("s", 0)
+        sent = message.pop("ts", None)
+        session = message.pop("f", None)
+        if session is not None and session != self.session:
+            # First snapshot, or the controller was restarted
+            self.session = session
+            self.seq = 0
+        if seq <= self.seq:
+            return False
+        if session is not None:
+            self.state = message
+            self.synced = True
+        elif self.synced:
+            if seq != self.seq + 1:
+                self.gaps += 1
+            self.state.update(message)
+        else:
+            return False
+        self.seq = seq
+        if sent is not None:
+            self.latency = time.time() - sent
+        return True
+
+    def receive(self):
+        try:
+            data, _ = self.sock.recvfrom(MAX_DATAGRAM)
+        except socket.timeout:
+            return False
+        self.received += 1
+        try:
+            message = json.loads(data)
+        except ValueError:
+            return False
+        return isinstance(message, dict) and self.apply(message)
+
+    def close(self):
+        self.sock.close()
+
+
+# ================= DISPLAY CLIENT =================
+def run_headless(receiver):
+    last = None
+    while True:
+        if receiver.receive():
+            shown = (receiver.state.get("text"), receiver.state.get("color"), receiver.state.get("running"))
+            if shown != last:
+                last = shown
+                print("%s\t%s\t%s" % (shown[0], shown[1], "RUNNING" if shown[2] else "PAUSED"), flush=True)
+
+
+def run_tk(receiver, font_size):
+    import tkinter as tk
+
+    root = tk.Tk()
+    root.title("Shot Clock Remote Display")
+    root.configure(bg="black")
+    label = tk.Label(root, text="--", font=("Arial", font_size, "bold"), fg="white", bg="black")
+    label.pack(expand=True, fill="both")
+    root.bind_all("<Escape>", lambda e: root.destroy())
+
+    shown = {"text": "--", "color": "white"}
+
+    def listen():
+        while True:
+            receiver.receive()
+
+    def poll():
+        state = receiver.state
+        text = state.get("text", shown["text"])
+        color = state.get("color", shown["color"])
+        if text != shown["text"] or color != shown["color"]:
+            shown["text"], shown["color"] = text, color
+            label.config(text=text, fg=color)
+        root.after(15, poll)
+
+    threading.Thread(target=listen, daemon=True).start()
+    poll()
+    root.mainloop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Remote shot clock display")
+    parser.add_argument("--group", default=DEFAULT_GROUP)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--interface", default="0.0.0.0", help="local address to join the group on")
+    parser.add_argument("--tk", action="store_true", help="show a Tk display window instead of printing")
+    parser.add_argument("--font-size", type=int, default=520)
+    args = parser.parse_args()
+
+    receiver = StateReceiver(args.group, args.port, args.interface)
+    try:
+        if args.tk:
+            run_tk(receiver, args.font_size)
+        else:
+            run_headless(receiver)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        receiver.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+import csv
+import json
+import math
+import os
+import platform
+import time
+
+# Buckets are quarter powers of two of a microsecond: about 19% wide, so
+# percentiles are accurate to that much while recording stays O(1).
+SUB_BUCKETS = 4
+METRICS = (
+    ("lateness", "timer lateness"),
+    ("render", "render time"),
+    ("input_to_paint", "input to paint"),
+    ("audio", "audio dispatch"),
+)
+
+
+def default_path():
+    # Per-user, like the journal: the working directory of a frozen exe may
+    # not be writable
+    base = os.environ.get("APPDATA") or os.path.join(os.path.expanduser("~"), ".local", "share")
+    return os.path.join(base, "SBA Shotclock", "perf", "shotclock-perf-%s.json" % time.strftime("%Y%m%d-%H%M%S"))
+
+
+class Histogram:
+    def __init__(self):
+        self.counts = {}
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+
+    def record(self, seconds):
+        us = seconds * 1e6
+        if us < 1:
+            bucket = 0
+        else:
+            mantissa, exponent = math.frexp(us)
+            bucket = (exponent - 1) * SUB_BUCKETS + int((mantissa * 2 - 1) * SUB_BUCKETS) + 1
+        self.counts[bucket] = self.counts.get(bucket, 0) + 1
+        self.count += 1
+        self.total += seconds
+        if self.min is None or seconds < self.min:
+            self.min = seconds
+        if self.max is None or seconds > self.max:
+            self.max = seconds
+
+    @staticmethod
+    def bucket_upper(bucket):
+        # Upper edge of a bucket, in seconds
+        if bucket == 0:
+            return 1e-6
+        exponent, sub = divmod(bucket - 1, SUB_BUCKETS)
+        return 2 ** exponent * (1 + (sub + 1) / SUB_BUCKETS) * 1e-6
+
+    def percentile(self, pct):
+        if not self.count:
+            return 0.0
+        target = self.count * pct / 100
+        seen = 0
+        for bucket in sorted(self.counts):
+            seen += self.counts[bucket]
+            if seen >= target:
+                return min(self.bucket_upper(bucket), self.max)
+        return self.max
+
+    def summary(self):
+        return {
+            "count": self.count,
+            "mean_ms": self.total / self.count * 1e3 if self.count else 0.0,
+            "min_ms": (self.min or 0.0) * 1e3,
+            "p50_ms": self.percentile(50) * 1e3,
+            "p90_ms": self.percentile(90) * 1e3,
+            "p99_ms": self.percentile(99) * 1e3,
+            "max_ms": (self.max or 0.0) * 1e3,
+        }
+
+
+class PerfMonitor:
+    # record() is a no-op while disabled, so call sites can stay in place
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.started = time.time()
+        self.histograms = {name: Histogram() for name, _ in METRICS}
+
+    def record(self, name, seconds):
+        if self.enabled:
+            self.histograms[name].record(seconds)
+
+    def toggle(self):
+        self.enabled = not self.enabled
+        return self.enabled
+
+    def overlay_text(self):
+        lines = []
+        for name, label in METRICS:
+            h = self.histograms[name]
+            lines.append("%-15s n=%-6d p50 %6.2f  p99 %6.2f  max %6.2f ms" % (
+                label, h.count, h.percentile(50) * 1e3, h.percentile(99) * 1e3, (h.max or 0.0) * 1e3))
+        return "\n".join(lines)
+
+    def report(self):
+        return {
+            "host": platform.node(),
+            "platform": platform.platform(),
+            "started": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(self.started)),
+            "duration_s": round(time.time() - self.started, 1),
+            "metrics": {name: self.histograms[name].summary() for name, _ in METRICS},
+            "buckets": {
+                name: {"%.6f" % Histogram.bucket_upper(b): n for b, n in sorted(self.histograms[name].counts.items())}
+                for name, _ in METRICS
+            },
+        }
+
+    def export(self, path):
+        # CSV for spreadsheets, anything else gets the full JSON report
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        if path.lower().endswith(".csv"):
+            with open(path, "w", newline="") as f:
+                writer = csv.writer(f)
+                writer.writerow(["metric", "bucket_upper_us", "count"])
+                for name, _ in METRICS:
+                    for bucket, count in sorted(self.histograms[name].counts.items()):
+                        writer.writerow([name, "%.2f" % (Histogram.bucket_upper(bucket) * 1e6), count])
+                writer.writerow([])
+                writer.writerow(["metric", "count", "mean_ms", "min_ms", "p50_ms", "p90_ms", "p99_ms", "max_ms"])
+                for name, _ in METRICS:
+                    s = self.histograms[name].summary()
+                    writer.writerow([name, s["count"]] + ["%.3f" % s[k] for k in
+                                    ("mean_ms", "min_ms", "p50_ms", "p90_ms", "p99_ms", "max_ms")])
+        else:
+            with open(path, "w") as f:
+                json.dump(self.report(), f, indent=2)
@@ -0,0 +1,257 @@
+import asyncio
+import json
+import queue
+import threading
+from concurrent.futures import Future
+
+from shotclock_engine import Settings
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 5990
+# The UI drains commands every POLL_MS while a client is connected and
+# every IDLE_POLL_MS otherwise
+POLL_MS = 4
+IDLE_POLL_MS = 100
+MAX_LINE = 64 * 1024
+# Subscribers that fall this far behind stop receiving events
+MAX_BACKLOG = 256 * 1024
+
+# Protocol: JSON lines. Each request line is one command or a list of
+# commands run together in a single turn of the UI loop:
+#   {"id": 1, "cmd": "start"}
+#   [{"id": 2, "cmd": "reset"}, {"id": 3, "cmd": "start"}]
+# Each command gets an acknowledgement (a list for a list):
+#   {"id": 1, "ok": true, "state": {...}}
+#   {"id": 1, "ok": false, "error": "..."}
+# After "subscribe", engine events are pushed as they happen:
+#   {"event": "tick", "state": {...}}
+COMMANDS = {
+    "start_game": "start_game",
+    "start": "start",
+    "pause": "pause",
+    "reset": "reset",
+    "extend": "add_extension",
+    "add_extension": "add_extension",
+    "set": "update_settings",
+    "state": None,
+    "subscribe": None,
+    "unsubscribe": None,
+}
+
+
+def parse_settings(values):
+    # Validates a partial settings update, returning only the given fields
+    if not isinstance(values, dict):
+        raise ValueError("settings must be an object")
+    parsed = Settings.parse(**values)
+    return {name: getattr(parsed, name) for name in values}
+
+
+# ================= DISPATCH =================
+class CommandDispatcher:
+    # Hands callables from the server thread to the thread that owns the
+    # engine; that thread calls drain() from its own loop.
+    def __init__(self):
+        self.queue = queue.SimpleQueue()
+
+    def submit(self, fn, *args):
+        future = Future()
+        self.queue.put((future, fn, args))
+        return future
+
+    def drain(self):
+        count = 0
+        while True:
+            try:
+                future, fn, args = self.queue.get_nowait()
+            except queue.Empty:
+                return count
+            count += 1
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(fn(*args))
+            except Exception as e:
+                future.set_exception(e)
+
+
+class EngineActions:
+    # Command target for a bare engine (headless runs and benchmarks);
+    # the Tk controller provides the same methods itself. The server calls
+    # actions with interactive=False: a target must raise ValueError rather
+    # than ask the operator.
+    def __init__(self, engine):
+        self.engine = engine
+
+    def start_game(self, interactive=True):
+        self.engine.start_game()
+
+    def start(self, interactive=True):
+        self.engine.start()
+
+    def pause(self, interactive=True):
+        self.engine.pause()
+
+    def reset(self, interactive=True):
+        self.engine.reset()
+
+    def add_extension(self, interactive=True):
+        self.engine.add_extension()
+
+    def update_settings(self, values):
+        if self.engine.running:
+            raise ValueError("settings are locked while the clock is running")
+        self.engine.configure(**parse_settings(values))
+
+
+# ================= SERVER =================
+class CommandServer:
+    def __init__(self, engine, actions, dispatcher, host=DEFAULT_HOST, port=DEFAULT_PORT, path=None):
+        self.engine = engine
+        self.actions = actions
+        self.dispatcher = dispatcher
+        self.host = host
+        self.port = port
+        self.path = path
+        self.subscribers = set()
+        self.handlers = set()
+        self.loop = None
+        self.server = None
+        self.ready = threading.Event()
+        self.error = None
+        self.thread = threading.Thread(target=self.run, name="shotclock-remote", daemon=True)
+        engine.subscribe(self.on_engine_event)
+
+    def start(self):
+        self.thread.start()
+        self.ready.wait()
+        if self.error:
+            self.engine.unsubscribe(self.on_engine_event)
+            raise self.error
+        return self
+
+    def run(self):
+        self.loop = asyncio.new_event_loop()
+        try:
+            self.server = self.loop.run_until_complete(self.listen())
+            if self.path is None:
+                self.port = self.server.sockets[0].getsockname()[1]
+        except Exception as e:
+            # Anything raised while binding must reach start(), never hang it
+            self.error = e
+            self.ready.set()
+            self.loop.close()
+            return
+        self.ready.set()
+        try:
+            self.loop.run_forever()
+        finally:
+            self.loop.run_until_complete(self.shutdown())
+            self.loop.close()
+
+    async def shutdown(self):
+        # Open connections are cancelled and finish closing before the loop
+        # goes away; on 3.12+ wait_closed() would otherwise wait for them
+        self.server.close()
+        for task in list(self.handlers):
+            task.cancel()
+        await asyncio.gather(*self.handlers, return_exceptions=True)
+        await self.server.wait_closed()
+
+    def listen(self):
+        if self.path:
+            return asyncio.start_unix_server(self.handle, path=self.path, limit=MAX_LINE)
+        return asyncio.start_server(self.handle, self.host, self.port, limit=MAX_LINE)
+
+    def close(self):
+        self.engine.unsubscribe(self.on_engine_event)
+        if self.loop and self.thread.is_alive():
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self.thread.join(timeout=1)
+
+    # ================= CONNECTIONS =================
+    async def handle(self, reader, writer):
+        task = asyncio.current_task()
+        self.handlers.add(task)
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    writer.write(encode({"ok": False, "error": "line too long"}))
+                    break
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                reply = await self.handle_line(line, writer)
+                writer.write(encode(reply))
+                await writer.drain()
+        except (ConnectionError, asyncio.CancelledError):
+            # Cancelled only at shutdown; ending normally keeps 3.11's stream
+            # callback from logging the cancellation as an error
+            pass
+        finally:
+            self.handlers.discard(task)
+            self.subscribers.discard(writer)
+            writer.close()
+
+    async def handle_line(self, line, writer):
+        try:
+            request = json.loads(line)
+        except ValueError:
+            return {"ok": False, "error": "invalid JSON"}
+        batch = isinstance(request, list)
+        requests = request if batch else [request]
+        for item in requests:
+            if isinstance(item, dict) and item.get("cmd") == "subscribe":
+                self.subscribers.add(writer)
+            elif isinstance(item, dict) and item.get("cmd") == "unsubscribe":
+                self.subscribers.discard(writer)
+        # The whole line runs in one turn of the UI loop
+        future = self.dispatcher.submit(self.execute, requests)
+        replies = await asyncio.wrap_future(future)
+        return replies if batch else replies[0]
+
+    # ================= EXECUTION (UI THREAD) =================
+    def execute(self, requests):
+        return [self.execute_one(item) for item in requests]
+
+    def execute_one(self, request):
+        if not isinstance(request, dict):
+            return {"ok": False, "error": "command must be an object"}
+        reply = {"id": request.get("id")}
+        name = request.get("cmd")
+        if not isinstance(name, str) or name not in COMMANDS:
+            reply.update(ok=False, error="unknown command %r" % (name,))
+            return reply
+        method = COMMANDS[name]
+        try:
+            if method == "update_settings":
+                self.actions.update_settings(request.get("settings"))
+            elif method:
+                getattr(self.actions, method)(interactive=False)
+        except ValueError as e:
+            reply.update(ok=False, error=str(e))
+            return reply
+        reply.update(ok=True, state=self.engine.state())
+        if name == "state":
+            reply["settings"] = self.engine.settings.as_dict()
+        return reply
+
+    def on_engine_event(self, event, engine):
+        if not self.subscribers or self.loop is None:
+            return
+        data = encode({"event": event, "state": engine.state()})
+        self.loop.call_soon_threadsafe(self.publish, data)
+
+    def publish(self, data):
+        for writer in list(self.subscribers):
+            if writer.transport.is_closing() or writer.transport.get_write_buffer_size() > MAX_BACKLOG:
+                self.subscribers.discard(writer)
+                continue
+            writer.write(data)
+
+
+def encode(message):
+    return (json.dumps(message, separators=(",", ":")) + "\n").encode("utf-8")